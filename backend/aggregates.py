@@ -0,0 +1,54 @@
+"""
+Periodic merging of per-industry aggregates into MongoDB.
+
+Benchmarks and rollups accumulate per-industry NumPy deltas in memory as
+results are submitted. A background task merges them into Mongo with one
+update per industry; deltas that fail to merge are kept for the next try.
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DeltaAggregator:
+    """Per-industry deltas waiting in _pending; subclasses merge one industry's delta in _merge()."""
+
+    # Logged when a periodic flush fails.
+    failure = "Failed to persist aggregates"
+
+    def __init__(self):
+        self._pending = {}
+
+    async def _merge(self, industry, delta):
+        raise NotImplementedError
+
+    async def merge_pending(self):
+        """Merge every pending delta; raises the last error after trying them all."""
+        pending, self._pending = self._pending, {}
+        error = None
+        for industry, delta in pending.items():
+            try:
+                await self._merge(industry, delta)
+            except Exception as e:
+                # Keep the deltas for the next flush.
+                self._pending[industry] = delta + self._pending.get(industry, 0)
+                error = e
+        if error is not None:
+            raise error
+
+    async def flush(self):
+        await self.merge_pending()
+
+    async def run(self, interval):
+        """Flush periodically until cancelled, then flush once more."""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.flush()
+                except Exception:
+                    logger.exception(self.failure)
+        finally:
+            await self.flush()
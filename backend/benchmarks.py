@@ -0,0 +1,170 @@
+"""
+Per-industry benchmark distributions of assessment scores.
+
+Scores are percentages rounded to one decimal, so each distribution is
+kept as an exact 1001-bin histogram (0.0 .. 100.0). Histograms merge by
+addition, which lets every worker $inc its local deltas into a shared
+document and then reload the merged totals.
+"""
+
+import numpy as np
+
+from aggregates import DeltaAggregator
+from framework import FRAMEWORK_INDEX
+
+NUM_BINS = 1001
+QUANTILES = (("p10", 0.10), ("p25", 0.25), ("p50", 0.50), ("p75", 0.75), ("p90", 0.90))
+
+
+def _bin(score_pct):
+    return min(max(int(round(score_pct * 10)), 0), NUM_BINS - 1)
+
+
+def _category_key(code):
+    # Mongo field names cannot contain dots.
+    return code.replace(".", "_")
+
+
+def summarize(counts):
+    """Count, mean and quantiles of one histogram."""
+    n = int(counts.sum())
+    if n == 0:
+        return {"count": 0}
+    cumulative = np.cumsum(counts)
+    summary = {"count": n, "mean": round(float(counts @ np.arange(NUM_BINS)) / n / 10, 1)}
+    for name, q in QUANTILES:
+        summary[name] = int(np.searchsorted(cumulative, q * n)) / 10
+    return summary
+
+
+def percentile_rank(counts, score_pct):
+    """Share of peers scoring below score_pct (ties count half), in percent."""
+    n = counts.sum()
+    if n == 0:
+        return None
+    b = _bin(score_pct)
+    return round(float(counts[:b].sum() + counts[b] / 2) / n * 100, 1)
+
+
+class BenchmarkStore(DeltaAggregator):
+    """Histograms per industry and metric (overall, each function, each category)."""
+
+    failure = "Failed to persist benchmark histograms"
+
+    def __init__(self, collection, industries, index=FRAMEWORK_INDEX):
+        super().__init__()
+        self.collection = collection
+        self.industries = set(industries)
+        self.index = index
+        self.metrics = (
+            [("overall", None)]
+            + [("functions", fid) for fid in index.function_ids]
+            + [("categories", code) for code in index.category_codes]
+        )
+        self._row = {metric: row for row, metric in enumerate(self.metrics)}
+        self._base = {}
+        self._summaries = {}
+
+    def _doc_id(self, industry):
+        return f"{industry}:{self.index.version}"
+
+    def _empty(self):
+        return np.zeros((len(self.metrics), NUM_BINS), dtype=np.int64)
+
+    def counts(self, industry):
+        base = self._base.get(industry)
+        pending = self._pending.get(industry)
+        if base is None:
+            return pending if pending is not None else self._empty()
+        return base if pending is None else base + pending
+
+    def add(self, industry, result):
+        """Record one scored assessment result."""
+        if industry not in self.industries:
+            return
+        pending = self._pending.get(industry)
+        if pending is None:
+            pending = self._pending[industry] = self._empty()
+        pending[0, _bin(result["overall_score"])] += 1
+        for fid, data in result["function_scores"].items():
+            pending[self._row[("functions", fid)], _bin(data["score_pct"])] += 1
+        for code, data in result["category_scores"].items():
+            pending[self._row[("categories", code)], _bin(data["score_pct"])] += 1
+        self._summaries.pop(industry, None)
+
+    def summary(self, industry):
+        cached = self._summaries.get(industry)
+        if cached is not None:
+            return cached
+        counts = self.counts(industry)
+        cached = {
+            "industry": industry,
+            "framework_version": self.index.version,
+            "overall": summarize(counts[0]),
+            "functions": {},
+            "categories": {},
+        }
+        for row, (group, key) in enumerate(self.metrics[1:], start=1):
+            cached[group][key] = summarize(counts[row])
+        self._summaries[industry] = cached
+        return cached
+
+    def position(self, industry, result):
+        """Percentile rank of one result against its industry peers."""
+        counts = self.counts(industry)
+        return {
+            "overall": percentile_rank(counts[0], result["overall_score"]),
+            "functions": {
+                fid: percentile_rank(counts[self._row[("functions", fid)]], data["score_pct"])
+                for fid, data in result["function_scores"].items()
+            },
+            "categories": {
+                code: percentile_rank(counts[self._row[("categories", code)]], data["score_pct"])
+                for code, data in result["category_scores"].items()
+            },
+        }
+
+    def _field(self, row):
+        group, key = self.metrics[row]
+        if group == "overall":
+            return "overall"
+        if group == "categories":
+            key = _category_key(key)
+        return f"{group}.{key}"
+
+    def _from_document(self, doc):
+        counts = self._empty()
+        fields = {self._field(row): row for row in range(len(self.metrics))}
+        sections = [("overall", doc.get("overall", {}))]
+        for group in ("functions", "categories"):
+            sections += [(f"{group}.{key}", bins) for key, bins in doc.get(group, {}).items()]
+        for field, bins in sections:
+            row = fields.get(field)
+            if row is None:
+                continue
+            for b, n in bins.items():
+                counts[row, int(b)] = n
+        return counts
+
+    async def load(self):
+        """Replace the in-memory base with the persisted, merged histograms."""
+        ids = [self._doc_id(industry) for industry in self.industries]
+        async for doc in self.collection.find({"_id": {"$in": ids}}):
+            self._base[doc["industry"]] = self._from_document(doc)
+        self._summaries.clear()
+
+    async def _merge(self, industry, delta):
+        rows, bins = np.nonzero(delta)
+        inc = {f"{self._field(r)}.{b}": int(delta[r, b]) for r, b in zip(rows.tolist(), bins.tolist())}
+        await self.collection.update_one(
+            {"_id": self._doc_id(industry)},
+            {"$inc": inc, "$set": {"industry": industry, "framework_version": self.index.version}},
+            upsert=True,
+        )
+
+    async def flush(self):
+        """Push local deltas with $inc, then reload everyone's merged totals."""
+        try:
+            await self.merge_pending()
+        finally:
+            await self.load()
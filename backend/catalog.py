@@ -0,0 +1,80 @@
+"""
+Pre-serialized responses for the static catalog endpoints.
+Payloads are JSON-encoded and gzipped once, then served with strong ETags.
+"""
+
+import gzip
+import hashlib
+import json
+
+from starlette.responses import Response
+
+CACHE_CONTROL = "public, max-age=300"
+
+
+class CatalogEntry:
+    """One static payload, encoded once in identity and gzip form."""
+
+    def __init__(self, payload):
+        # Same encoding as starlette's JSONResponse.
+        self.body = json.dumps(
+            payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:20]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+    def response(self, request):
+        use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+        etag = self.gzip_etag if use_gzip else self.etag
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+        if _etag_matches(request.headers.get("if-none-match"), (self.etag, self.gzip_etag)):
+            return Response(status_code=304, headers=headers)
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.gzip_body, media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+def _accepts_gzip(accept_encoding):
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _etag_matches(if_none_match, etags):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix is ignored.
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return any(etag in candidates for etag in etags)
+
+
+def build_catalog(functions, questions, maturity_levels, industry_recommendations):
+    industries = [
+        {
+            "id": key,
+            "name": val["name"],
+            "code": val["code"],
+            "regulations": val["regulations"],
+            "description": val["description"],
+        }
+        for key, val in industry_recommendations.items()
+    ]
+    return {
+        "questions": CatalogEntry({
+            "functions": functions,
+            "questions": questions,
+            "maturity_levels": maturity_levels,
+            "total_questions": len(questions),
+        }),
+        "industries": CatalogEntry({"industries": industries}),
+        "maturity_levels": CatalogEntry(maturity_levels),
+        "recommendations": {key: CatalogEntry(val) for key, val in industry_recommendations.items()},
+    }
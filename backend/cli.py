@@ -0,0 +1,182 @@
+"""
+Command-line tools for operating on stored assessments.
+
+    python cli.py export --format csv --output assessments.csv --industry finance
+    python cli.py snapshot
+    python cli.py rebuild-aggregates
+    python cli.py dump-framework --output frameworks/nist-ai-rmf.json
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import typer
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks import BenchmarkStore
+from export import DEFAULT_BATCH_SIZE, FORMATS, open_cursor, stream
+from framework import FRAMEWORK_INDEX
+from listing import build_query
+from registry import BUILTIN_FRAMEWORK_ID, builtin_definition, framework_query, load_registry
+from rollups import RollupAggregator
+from snapshot import build_snapshot
+from versions import FrameworkVersions
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+app = typer.Typer()
+
+
+@app.callback()
+def main():
+    """NIST AI RMF Assessment maintenance commands."""
+
+
+def get_db():
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    return client, client[os.environ['DB_NAME']]
+
+
+def get_framework(framework_id):
+    registry = load_registry(
+        os.environ.get('FRAMEWORKS_DIR', ROOT_DIR / 'frameworks'),
+        os.environ.get('DEFAULT_FRAMEWORK', BUILTIN_FRAMEWORK_ID),
+    )
+    try:
+        return registry.get(framework_id)
+    except KeyError:
+        raise typer.BadParameter(f"Unknown framework {framework_id!r}")
+
+
+@app.command()
+def export(
+    format: str = typer.Option("ndjson", help=f"One of: {', '.join(FORMATS)}"),
+    output: Optional[Path] = typer.Option(None, help="File to write; defaults to stdout"),
+    industry: Optional[str] = None,
+    organization_name: Optional[str] = None,
+    maturity: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    framework: Optional[str] = typer.Option(None, help="Framework id; defaults to DEFAULT_FRAMEWORK"),
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    """Stream assessments out of the database as NDJSON or flattened CSV."""
+    if format not in FORMATS:
+        raise typer.BadParameter(f"format must be one of {', '.join(FORMATS)}")
+    scored_with = get_framework(framework)
+    query = build_query(industry, organization_name, maturity, created_from, created_to,
+                        framework=framework_query(scored_with.id))
+
+    async def run(out):
+        client, db = get_db()
+        try:
+            cursor = open_cursor(db.assessments, query, batch_size)
+            versions = FrameworkVersions(db.framework_versions)
+            async for chunk in stream(format, cursor, batch_size, scored_with.index, scored_with.actions, versions):
+                out.write(chunk)
+        finally:
+            client.close()
+
+    if output is None:
+        asyncio.run(run(sys.stdout.buffer))
+    else:
+        with open(output, "wb") as out:
+            asyncio.run(run(out))
+
+
+@app.command()
+def snapshot(
+    output_dir: Path = typer.Option(
+        Path(os.environ.get('SNAPSHOT_DIR', ROOT_DIR / 'snapshots')), help="Snapshot root directory"
+    ),
+    framework: Optional[str] = typer.Option(None, help="Framework id; defaults to DEFAULT_FRAMEWORK"),
+    batch_size: int = 5000,
+):
+    """Materialize all assessments of one framework into a columnar, memory-mappable snapshot."""
+    scored_with = get_framework(framework)
+
+    async def run():
+        client, db = get_db()
+        try:
+            return await build_snapshot(db.assessments, output_dir, batch_size, scored_with.engine,
+                                        framework_query(scored_with.id), FrameworkVersions(db.framework_versions))
+        finally:
+            client.close()
+
+    path = asyncio.run(run())
+    typer.echo(f"Snapshot written to {path}")
+
+
+AGGREGATE_FIELDS = ("industry", "overall_score", "overall_maturity", "function_scores", "category_scores")
+
+
+def aggregate_query(framework, versions):
+    """Mongo filter for the assessments that belong in framework's benchmarks and rollups."""
+    scored = [{"framework_version": {"$in": versions}}]
+    if framework.id == BUILTIN_FRAMEWORK_ID and framework.index.version == FRAMEWORK_INDEX.version:
+        # Documents from before versions were recorded were scored with backend/data/.
+        scored.append({"framework_version": None})
+    return {**framework_query(framework.id), "$or": scored}
+
+
+async def backfill_aggregates(db, framework, batch_size=DEFAULT_BATCH_SIZE):
+    """Replace framework's benchmarks and rollups with ones computed from every stored assessment.
+
+    Only assessments scored with framework's question layout are counted,
+    the same ones the server adds as they are submitted. Returns their number.
+    """
+    versions = await FrameworkVersions(db.framework_versions).layout_versions(framework)
+    stores = [
+        BenchmarkStore(db.benchmarks, framework.industries, framework.index),
+        RollupAggregator(db.rollups, framework.industries, framework.index),
+    ]
+    for store in stores:
+        await store.collection.delete_many({"framework_version": framework.index.version})
+    count = 0
+    cursor = db.assessments.find(aggregate_query(framework, versions), {field: 1 for field in AGGREGATE_FIELDS})
+    async for doc in cursor.batch_size(batch_size):
+        for store in stores:
+            store.add(doc["industry"], doc)
+        count += 1
+    for store in stores:
+        await store.flush()
+    return count
+
+
+@app.command()
+def rebuild_aggregates(batch_size: int = DEFAULT_BATCH_SIZE):
+    """Recompute the default framework's benchmarks and rollups from the stored assessments."""
+    scored_with = get_framework(None)
+
+    async def run():
+        client, db = get_db()
+        try:
+            return await backfill_aggregates(db, scored_with, batch_size)
+        finally:
+            client.close()
+
+    count = asyncio.run(run())
+    typer.echo(f"Rebuilt benchmarks and rollups of {scored_with.id} from {count} assessments")
+
+
+@app.command()
+def dump_framework(
+    output: Optional[Path] = typer.Option(None, help="File to write; defaults to stdout"),
+):
+    """Write the built-in framework as JSON, to edit and hot-reload from FRAMEWORKS_DIR."""
+    text = json.dumps(builtin_definition(), indent=2, ensure_ascii=False) + "\n"
+    if output is None:
+        sys.stdout.write(text)
+    else:
+        output.write_text(text, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,103 @@
+"""
+Streaming export of stored assessments as NDJSON or flattened CSV.
+Documents are pulled through a server-side cursor and encoded chunk by
+chunk, so memory use does not depend on the number of rows exported.
+"""
+
+import csv
+import io
+import json
+
+from framework import ACTION_INDEX, FRAMEWORK_INDEX
+from listing import to_list_item
+from storage import answer_vector
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def csv_header(index=FRAMEWORK_INDEX):
+    return (
+        ["id", "industry", "organization_name", "created_at", "overall_score", "overall_maturity"]
+        + [f"{fid}_score_pct" for fid in index.function_ids]
+        + [f"{code}_score_pct" for code in index.category_codes]
+        + [f"q_{qid}" for qid in index.question_ids]
+    )
+
+
+def csv_row(doc, index=FRAMEWORK_INDEX, source=None):
+    answers = answer_vector(doc, index, source)
+    # Answers packed in a layout that was never recorded are left empty.
+    answer_cells = [""] * index.num_questions if answers is None else [score or "" for score in answers.tolist()]
+    function_scores = doc.get("function_scores", {})
+    category_scores = doc.get("category_scores", {})
+    return (
+        [doc["id"], doc["industry"], doc.get("organization_name"), doc["created_at"],
+         doc["overall_score"], doc["overall_maturity"]]
+        + [function_scores.get(fid, {}).get("score_pct", "") for fid in index.function_ids]
+        + [category_scores.get(code, {}).get("score_pct", "") for code in index.category_codes]
+        + answer_cells
+    )
+
+
+def open_cursor(collection, query, batch_size=DEFAULT_BATCH_SIZE):
+    return collection.find(query).sort([("created_at", -1), ("_id", -1)]).batch_size(batch_size)
+
+
+async def _batches(cursor, batch_size):
+    batch = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def stream_ndjson(cursor, batch_size=DEFAULT_BATCH_SIZE, index=FRAMEWORK_INDEX, actions=ACTION_INDEX,
+                        versions=None):
+    async for batch in _batches(cursor, batch_size):
+        if versions is not None:
+            await versions.resolve(batch)
+            items = [to_list_item(doc, *versions.decoders(doc, index, actions)) for doc in batch]
+        else:
+            items = [to_list_item(doc, index, actions) for doc in batch]
+        yield "".join(
+            json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n" for item in items
+        ).encode("utf-8")
+
+
+async def stream_csv(cursor, batch_size=DEFAULT_BATCH_SIZE, index=FRAMEWORK_INDEX, versions=None):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(csv_header(index))
+    async for batch in _batches(cursor, batch_size):
+        if versions is not None:
+            await versions.resolve(batch)
+        for doc in batch:
+            source = versions.decoders(doc, index, None)[0] if versions is not None else None
+            writer.writerow(csv_row(doc, index, source))
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def stream(fmt, cursor, batch_size=DEFAULT_BATCH_SIZE, index=FRAMEWORK_INDEX, actions=ACTION_INDEX, versions=None):
+    """Encode a cursor over documents scored against the framework of index/actions.
+
+    versions, a FrameworkVersions, decodes documents scored by earlier
+    versions of the framework with the layout and action templates recorded
+    for them; CSV columns always follow index.
+    """
+    if fmt == "ndjson":
+        return stream_ndjson(cursor, batch_size, index, actions, versions)
+    if fmt == "csv":
+        return stream_csv(cursor, batch_size, index, versions)
+    raise ValueError(f"format must be one of {', '.join(FORMATS)}")
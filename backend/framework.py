@@ -0,0 +1,136 @@
+"""
+Compiled indexes over the assessment framework data.
+Built once at import so request handlers never rescan QUESTIONS, FUNCTIONS
+or ACTION_TEMPLATES.
+"""
+
+import hashlib
+import json
+from bisect import bisect_right
+
+from data.questions import QUESTIONS, FUNCTIONS
+from data.actions import ACTION_TEMPLATES
+
+SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
+class FrameworkIndex:
+    """Dense, read-only lookup tables derived from FUNCTIONS and QUESTIONS.
+
+    Questions are addressed by slot (their position in QUESTIONS), functions
+    and categories by their position in the compiled order. Category order
+    follows FUNCTIONS order, then first appearance within the function, which
+    is the order the scorer has always emitted categories in.
+    """
+
+    def __init__(self, functions, questions):
+        self.question_ids = tuple(q["id"] for q in questions)
+        self.slots = {qid: slot for slot, qid in enumerate(self.question_ids)}
+        self.weights = tuple(q.get("weight", 1) for q in questions)
+
+        # Functions without questions are never scored, so they are left out.
+        scored = {q["function"] for q in questions}
+        self.functions = tuple(f for f in functions if f["id"] in scored)
+        self.function_ids = tuple(f["id"] for f in self.functions)
+        function_pos = {fid: i for i, fid in enumerate(self.function_ids)}
+
+        category_codes = []
+        category_names = []
+        category_function = []
+        category_pos = {}
+        for func_idx, func_id in enumerate(self.function_ids):
+            for q in questions:
+                if q["function"] != func_id or q["category"] in category_pos:
+                    continue
+                category_pos[q["category"]] = len(category_codes)
+                category_codes.append(q["category"])
+                category_names.append(q["category_name"])
+                category_function.append(func_idx)
+
+        self.category_codes = tuple(category_codes)
+        self.category_names = tuple(category_names)
+        self.category_function = tuple(category_function)
+        self.question_function = tuple(function_pos[q["function"]] for q in questions)
+        self.question_category = tuple(category_pos[q["category"]] for q in questions)
+
+        # Anything that changes slot layout or scoring changes the version.
+        layout = [[q["id"], q["function"], q["category"], q.get("weight", 1)] for q in questions]
+        self.version = hashlib.sha256(json.dumps(layout).encode()).hexdigest()[:12]
+
+    @property
+    def num_questions(self):
+        return len(self.question_ids)
+
+    def score_vector(self, answers):
+        """Map answers onto a dense per-slot score list (0 = unanswered).
+
+        Answers for unknown question ids are ignored; for repeated ids the
+        last answer wins, matching the previous dict-based behaviour.
+        """
+        scores = [0] * len(self.question_ids)
+        slots = self.slots
+        for a in answers:
+            slot = slots.get(a.question_id)
+            if slot is not None:
+                scores[slot] = a.score
+        return scores
+
+
+def action_id(func_id, cat_code, title):
+    """Stable 8-character id for an action template."""
+    return hashlib.sha1(f"{func_id}:{cat_code}:{title}".encode()).hexdigest()[:8]
+
+
+class ActionIndex:
+    """ACTION_TEMPLATES compiled into per-category, threshold-sorted arrays.
+
+    An action fires when its category's average score is below its threshold,
+    so with thresholds sorted ascending the fired actions of a category are
+    the suffix starting at bisect_right(thresholds, avg).
+    """
+
+    def __init__(self, templates):
+        self.categories = []
+        self.by_id = {}
+        position = 0
+        for func_id, categories in templates.items():
+            for cat_code, cat_data in categories.items():
+                entries = []
+                for action in cat_data["actions"]:
+                    base = {
+                        "id": action_id(func_id, cat_code, action["title"]),
+                        "function": func_id,
+                        "category": cat_code,
+                        "category_name": cat_data["category_name"],
+                        "severity": action["severity"],
+                        "title": action["title"],
+                        "description": action["description"],
+                        "timeline": action["timeline"],
+                        "resources": action["resources"],
+                    }
+                    if base["id"] in self.by_id:
+                        raise ValueError(f"Duplicate action template {func_id}/{cat_code}: {action['title']!r}")
+                    self.by_id[base["id"]] = base
+                    severity_rank = SEVERITY_ORDER.get(action["severity"], 99)
+                    # Template position breaks ties the same way the old stable sort did.
+                    entries.append((action["threshold"], severity_rank, position, base))
+                    position += 1
+                entries.sort(key=lambda entry: entry[0])
+                self.categories.append((cat_code, tuple(e[0] for e in entries), tuple(entries)))
+
+    def generate(self, category_scores):
+        """Fired actions ordered by severity, then current score, then template order."""
+        fired = []
+        for cat_code, thresholds, entries in self.categories:
+            avg = category_scores.get(cat_code, {}).get("avg_score", 0)
+            for threshold, severity_rank, position, base in entries[bisect_right(thresholds, avg):]:
+                fired.append((severity_rank, avg, position, base, threshold))
+        fired.sort(key=lambda hit: hit[:3])
+        return [
+            {**base, "current_score": avg, "target_score": threshold}
+            for _, avg, _, base, threshold in fired
+        ]
+
+
+FRAMEWORK_INDEX = FrameworkIndex(FUNCTIONS, QUESTIONS)
+ACTION_INDEX = ActionIndex(ACTION_TEMPLATES)
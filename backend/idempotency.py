@@ -0,0 +1,75 @@
+"""
+Idempotency keys for assessment submissions.
+
+A submission is identified by the client's Idempotency-Key header, scoped
+to its organization so one client's key can never replay another's result.
+Optionally (IDEMPOTENCY_CONTENT_DEDUP), submissions without the header are
+identified by a canonical hash of their content instead; anonymous ones
+never are, since different people answering alike would be merged.
+
+The first request to claim a key inserts {_id: key, assessment_id,
+request_hash} into the submission_keys collection; the unique _id makes the
+claim atomic across workers, and a TTL index on created_at bounds the
+window in which repeats are collapsed. A repeat whose request hash differs
+from the claim's reused the key for a different submission.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+IDEMPOTENCY_WINDOW_SECONDS = int(os.environ.get('IDEMPOTENCY_WINDOW_SECONDS', '600'))
+IDEMPOTENCY_CONTENT_DEDUP = os.environ.get('IDEMPOTENCY_CONTENT_DEDUP', 'false').lower() in ('1', 'true', 'yes')
+
+ANONYMOUS = "Anonymous"
+
+
+def request_hash(submission, framework):
+    """Canonical hash of what a submission asks for; answer order does not matter."""
+    # Last answer wins for repeated ids, as in scoring.
+    answers = sorted({a.question_id: a.score for a in submission.answers}.items())
+    canonical = json.dumps(
+        [framework.id, submission.industry, submission.organization_name, answers],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def submission_key(submission, framework, digest, header=None):
+    """Idempotency key for a submission with request hash digest, or None if it is not deduplicated."""
+    if header:
+        scoped = json.dumps([submission.organization_name, header], separators=(",", ":"))
+        return "key:" + hashlib.sha256(scoped.encode("utf-8")).hexdigest()
+    if not IDEMPOTENCY_CONTENT_DEDUP or submission.organization_name in (None, ANONYMOUS):
+        return None
+    return f"sha256:{framework.version}:{digest}"
+
+
+async def claim(collection, key, assessment_id, digest):
+    """Claim key for assessment_id.
+
+    Returns None if this call won the claim, otherwise the earlier claim's
+    document (assessment_id and request_hash).
+    """
+    try:
+        await collection.insert_one({
+            "_id": key,
+            "assessment_id": assessment_id,
+            "request_hash": digest,
+            "created_at": datetime.now(timezone.utc),
+        })
+        return None
+    except DuplicateKeyError:
+        existing = await collection.find_one({"_id": key})
+        if existing is None:
+            # The earlier claim expired or was released in between; try again.
+            return await claim(collection, key, assessment_id, digest)
+        return existing
+
+
+async def release(collection, key, assessment_id):
+    """Drop a claim whose submission could not be stored."""
+    await collection.delete_one({"_id": key, "assessment_id": assessment_id})
@@ -0,0 +1,79 @@
+"""
+MongoDB indexes the API depends on.
+Declared here, created (idempotently) and verified at startup.
+"""
+
+import logging
+import os
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from idempotency import IDEMPOTENCY_WINDOW_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DRAFT_TTL_SECONDS = int(os.environ.get('DRAFT_TTL_SECONDS', str(7 * 24 * 3600)))
+
+INDEXES = {
+    "assessments": [
+        # get_assessment reads by _id; this keeps the public id unique as well.
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # Listing pages through (created_at, _id) descending, optionally filtered.
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel(
+            [("industry", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="industry_created_at_id",
+        ),
+        IndexModel(
+            [("organization_name", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="organization_created_at_id",
+        ),
+        IndexModel(
+            [("overall_maturity", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="maturity_created_at_id",
+        ),
+    ],
+    "drafts": [
+        # Abandoned drafts expire DRAFT_TTL_SECONDS after their last saved answer.
+        IndexModel([("updated_at", ASCENDING)], name="updated_at_ttl", expireAfterSeconds=DRAFT_TTL_SECONDS),
+    ],
+    "framework_versions": [
+        # Packed answers name only their layout; any version recorded with it decodes them.
+        IndexModel([("layout_version", ASCENDING)], name="layout_version"),
+    ],
+    "submission_keys": [
+        # Claims are unique by _id; repeats are collapsed only inside this window.
+        IndexModel(
+            [("created_at", ASCENDING)],
+            name="created_at_ttl",
+            expireAfterSeconds=max(IDEMPOTENCY_WINDOW_SECONDS, 0),
+        ),
+    ],
+}
+
+
+async def ensure_indexes(db):
+    """Create every declared index and check that it exists with the declared keys.
+
+    Returns the names of indexes that are missing or differ. Problems are
+    logged rather than raised: without its indexes the API is slower, not
+    wrong.
+    """
+    problems = []
+    for collection, models in INDEXES.items():
+        try:
+            await db[collection].create_indexes(models)
+        except OperationFailure as e:
+            logger.error("Could not create indexes on %s: %s", collection, e)
+
+        existing = await db[collection].index_information()
+        for model in models:
+            spec = model.document
+            found = existing.get(spec["name"])
+            if found is None or list(found["key"]) != list(spec["key"].items()):
+                logger.error("Index %s.%s is missing or does not match %s", collection, spec["name"], dict(spec["key"]))
+                problems.append(f"{collection}.{spec['name']}")
+    if not problems:
+        logger.info("Verified %d MongoDB indexes", sum(len(m) for m in INDEXES.values()))
+    return problems
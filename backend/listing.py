@@ -0,0 +1,84 @@
+"""
+Keyset-paginated listing of stored assessments.
+Pages are ordered by (created_at, _id) descending and continue from an
+opaque cursor holding the last key served.
+"""
+
+import base64
+import json
+from datetime import timezone
+
+from framework import ACTION_INDEX, FRAMEWORK_INDEX
+from storage import answer_list, from_document
+
+# Large or rarely needed fields, only returned when asked for.
+OPTIONAL_FIELDS = ("answers", "priority_actions")
+
+
+def encode_cursor(doc):
+    key = json.dumps([doc["created_at"], doc["_id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(created_at, str) or not isinstance(doc_id, str):
+        raise ValueError("Invalid cursor")
+    return created_at, doc_id
+
+
+def _iso(value):
+    # created_at is stored as a UTC ISO-8601 string, which sorts chronologically.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def build_query(industry=None, organization_name=None, maturity=None,
+                created_from=None, created_to=None, cursor=None, framework=None):
+    query = dict(framework) if framework else {}
+    if industry is not None:
+        query["industry"] = industry
+    if organization_name is not None:
+        query["organization_name"] = organization_name
+    if maturity is not None:
+        query["overall_maturity"] = maturity
+    created = {}
+    if created_from is not None:
+        created["$gte"] = _iso(created_from)
+    if created_to is not None:
+        created["$lt"] = _iso(created_to)
+    if created:
+        query["created_at"] = created
+    if cursor is not None:
+        created_at, doc_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": doc_id}},
+        ]
+    return query
+
+
+def build_projection(include=()):
+    projection = {"answers_packed": 0} if "answers" not in include else {}
+    for field in OPTIONAL_FIELDS:
+        if field not in include:
+            projection[field] = 0
+    return projection
+
+
+def to_list_item(doc, index=FRAMEWORK_INDEX, actions=ACTION_INDEX):
+    """Shape a projected document for the listing response.
+
+    answers is None when they were packed in a layout that is not recorded.
+    """
+    doc.pop("_id", None)
+    if "answers" in doc or "answers_packed" in doc:
+        doc["answers"] = answer_list(doc, index)
+        doc.pop("answers_packed", None)
+    return from_document(doc, actions)
@@ -0,0 +1,116 @@
+"""
+Incremental scoring for assessments that are still being answered.
+
+LiveScorer keeps running weighted totals per function and per category and
+adjusts them by the difference between an answer's old and new score, so
+each answer costs O(1) regardless of how many questions are already
+answered. Scores are rounded and labelled exactly like the batch scorer.
+"""
+
+from framework import FRAMEWORK_INDEX
+from scoring import get_maturity_label
+
+
+def _ratio(total, max_total, scale):
+    return round(total / max_total * scale, 1) if max_total > 0 else 0.0
+
+
+class LiveScorer:
+    """Running score state for one in-progress assessment."""
+
+    def __init__(self, index=FRAMEWORK_INDEX, answers=None):
+        self.index = index
+        self.answers = {}
+        self.total = 0
+        self.max_total = 0
+        self.function_total = [0] * len(index.functions)
+        self.function_max = [0] * len(index.functions)
+        self.category_total = [0] * len(index.category_codes)
+        self.category_max = [0] * len(index.category_codes)
+        for question_id, score in (answers or {}).items():
+            if question_id in index.slots:
+                self.set(question_id, score)
+
+    def set(self, question_id, score):
+        """Record an answer (score 0 clears it) and return the update payload.
+
+        Raises KeyError for question ids that are not in the framework.
+        """
+        slot = self.index.slots[question_id]
+        old = self.answers.get(question_id, 0)
+        if score:
+            self.answers[question_id] = score
+        else:
+            self.answers.pop(question_id, None)
+
+        weight = self.index.weights[slot]
+        func_idx = self.index.question_function[slot]
+        cat_idx = self.index.question_category[slot]
+        answered = (score > 0) - (old > 0)
+
+        self.total += score - old
+        self.max_total += 5 * answered
+        self.function_total[func_idx] += weight * (score - old)
+        self.function_max[func_idx] += 5 * weight * answered
+        self.category_total[cat_idx] += weight * (score - old)
+        self.category_max[cat_idx] += 5 * weight * answered
+
+        return {
+            "question_id": question_id,
+            "score": score,
+            **self._overall(),
+            "function": self._function(func_idx),
+            "category": self._category(cat_idx),
+            "radar_data": self.radar_data(),
+        }
+
+    def _overall(self):
+        return {
+            "answered": len(self.answers),
+            "total_questions": self.index.num_questions,
+            "overall_score": _ratio(self.total, self.max_total, 100),
+            "overall_maturity": get_maturity_label(_ratio(self.total, self.max_total, 5)),
+        }
+
+    def _function(self, func_idx):
+        func = self.index.functions[func_idx]
+        avg = _ratio(self.function_total[func_idx], self.function_max[func_idx], 5)
+        return {
+            "id": func["id"],
+            "name": func["name"],
+            "score_pct": _ratio(self.function_total[func_idx], self.function_max[func_idx], 100),
+            "avg_score": avg,
+            "maturity": get_maturity_label(avg),
+        }
+
+    def _category(self, cat_idx):
+        avg = _ratio(self.category_total[cat_idx], self.category_max[cat_idx], 5)
+        return {
+            "code": self.index.category_codes[cat_idx],
+            "name": self.index.category_names[cat_idx],
+            "function": self.index.function_ids[self.index.category_function[cat_idx]],
+            "answered": self.category_max[cat_idx] > 0,
+            "score_pct": _ratio(self.category_total[cat_idx], self.category_max[cat_idx], 100),
+            "avg_score": avg,
+            "maturity": get_maturity_label(avg),
+        }
+
+    def radar_data(self):
+        """Same shape as build_radar_data; one entry per function."""
+        return [
+            {
+                "function": func["name"],
+                "score": _ratio(self.function_total[i], self.function_max[i], 100),
+                "fullMark": 100,
+            }
+            for i, func in enumerate(self.index.functions)
+        ]
+
+    def state(self):
+        """Full current state, sent when a live session starts."""
+        return {
+            **self._overall(),
+            "functions": [self._function(i) for i in range(len(self.index.functions))],
+            "categories": [self._category(i) for i in range(len(self.index.category_codes))],
+            "radar_data": self.radar_data(),
+        }
@@ -0,0 +1,156 @@
+"""
+On-demand sampling profiler for a running worker.
+
+A background thread wakes every interval, reads every thread's current
+stack from sys._current_frames() and counts each stack in the collapsed
+format that flamegraph.pl, speedscope and inferno read ("a;b;c 42"). The
+stacks of the event loop thread show time spent in handlers, scoring and
+loop idling; executor threads show Motor's blocking pymongo calls. The
+sampler needs the GIL, so a long pure-Python stretch is sampled at the
+interpreter's switch interval rather than the requested one.
+
+When asked, tracemalloc runs for the same window, and the memory still
+allocated at the end but not at the start is attributed to the route
+whose handler appears in each allocation's traceback. tracemalloc slows
+every allocation down considerably, so it is opt-in and keeps only enough
+frames to reach from the scoring code back to the handler.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+TRACEMALLOC_FRAMES = 16
+
+
+def _label(code, cache):
+    label = cache.get(code)
+    if label is None:
+        label = cache[code] = f"{code.co_qualname} ({os.path.basename(code.co_filename)})"
+    return label
+
+
+class StackSampler:
+    """Counts collapsed stacks of the given threads (default: all others) until stopped."""
+
+    def __init__(self, interval, thread_ids=None):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self):
+        me = threading.get_ident()
+        labels = {}
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me or (self.thread_ids is not None and ident not in self.thread_ids):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_label(frame.f_code, labels))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, limit=25):
+        """Hottest functions by samples in which they were running (self), with
+        the samples in which they were anywhere on the stack (total)."""
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        return [
+            {"function": function, "self": count, "total": total[function]}
+            for function, count in own.most_common(limit)
+        ]
+
+
+class RouteLocator:
+    """Maps source lines to the route whose endpoint function contains them."""
+
+    def __init__(self, routes):
+        # filename -> [(first line, last line, route path)]
+        self._ranges = {}
+        for path, endpoint in routes:
+            code = getattr(endpoint, "__code__", None)
+            if code is None:
+                continue
+            lines = [line for _, _, line in code.co_lines() if line is not None]
+            self._ranges.setdefault(code.co_filename, []).append((min(lines), max(lines), path))
+
+    def route(self, traceback):
+        for frame in traceback:
+            for first, last, path in self._ranges.get(frame.filename, ()):
+                if first <= frame.lineno <= last:
+                    return path
+        return None
+
+
+class AllocationTracker:
+    """Net memory allocated during a window, by route and by allocation site."""
+
+    def __init__(self, routes):
+        self.locator = RouteLocator(routes)
+        self._owns_tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._owns_tracing = True
+        tracemalloc.reset_peak()
+        self._before = tracemalloc.take_snapshot()
+
+    def stop(self):
+        after = tracemalloc.take_snapshot()
+        _, self.peak = tracemalloc.get_traced_memory()
+        self.frames = tracemalloc.get_traceback_limit()
+        if self._owns_tracing:
+            tracemalloc.stop()
+        # Drop the profiler's own bookkeeping (the sampler's stack counts).
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__, all_frames=True)]
+        self.diff = after.filter_traces(ignore).compare_to(self._before.filter_traces(ignore), "traceback")
+
+    def summary(self, limit=10):
+        routes = {}
+        for stat in self.diff:
+            if stat.size_diff <= 0:
+                continue
+            path = self.locator.route(stat.traceback) or "(outside route handlers)"
+            entry = routes.setdefault(path, {"route": path, "bytes": 0, "blocks": 0, "sites": Counter()})
+            entry["bytes"] += stat.size_diff
+            entry["blocks"] += max(stat.count_diff, 0)
+            site = stat.traceback[-1]
+            entry["sites"][f"{os.path.basename(site.filename)}:{site.lineno}"] += stat.size_diff
+        ranked = sorted(routes.values(), key=lambda entry: entry["bytes"], reverse=True)
+        for entry in ranked:
+            entry["sites"] = [{"site": site, "bytes": size} for site, size in entry["sites"].most_common(limit)]
+        return {
+            "traced_frames": self.frames,
+            "peak_bytes": self.peak,
+            "routes": ranked,
+        }
@@ -0,0 +1,322 @@
+"""
+Registry of compiled assessment frameworks.
+
+The built-in NIST AI RMF comes from the data/ modules unless a file in
+FRAMEWORKS_DIR redefines it; further frameworks are read from *.json files
+in the same directory. Every definition is validated and compiled into a
+Framework holding its question index, scoring engine, action index and
+pre-serialized catalog responses, and is identified by its id plus a
+content-hash version. A registry is never modified; reloading builds a new
+one that replaces it.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from catalog import build_catalog
+from data.actions import ACTION_TEMPLATES
+from data.questions import FUNCTIONS, MATURITY_LEVELS, QUESTIONS
+from data.recommendations import INDUSTRY_RECOMMENDATIONS
+from framework import SEVERITY_ORDER, ActionIndex, FrameworkIndex
+from scoring import ScoringEngine
+
+logger = logging.getLogger(__name__)
+
+BUILTIN_FRAMEWORK_ID = "nist-ai-rmf"
+
+FUNCTION_FIELDS = ("id", "name", "code", "description", "color")
+QUESTION_FIELDS = ("id", "function", "category", "category_name", "question", "guidance")
+ACTION_FIELDS = ("severity", "threshold", "title", "description", "timeline", "resources")
+INDUSTRY_FIELDS = ("name", "code", "regulations", "description", "recommendations")
+
+
+class FrameworkError(ValueError):
+    """A framework definition failed validation."""
+
+    def __init__(self, framework_id, problems):
+        self.framework_id = framework_id
+        self.problems = problems
+        super().__init__(f"Invalid framework {framework_id!r}: " + "; ".join(problems))
+
+
+def builtin_definition():
+    return {
+        "id": BUILTIN_FRAMEWORK_ID,
+        "name": "NIST AI Risk Management Framework",
+        "functions": FUNCTIONS,
+        "questions": QUESTIONS,
+        "maturity_levels": MATURITY_LEVELS,
+        "action_templates": ACTION_TEMPLATES,
+        "industry_recommendations": INDUSTRY_RECOMMENDATIONS,
+    }
+
+
+def validate_definition(definition):
+    """Raise FrameworkError listing every problem found in a definition."""
+    problems = []
+
+    def malformed(kind, item, fields, text_fields=()):
+        if not isinstance(item, dict):
+            problems.append(f"{kind} must be an object")
+            return True
+        absent = [f for f in fields if f not in item]
+        if absent:
+            problems.append(f"{kind} is missing {', '.join(absent)}")
+            return True
+        not_text = [f for f in text_fields if not isinstance(item[f], str)]
+        if not_text:
+            problems.append(f"{kind} has non-string {', '.join(not_text)}")
+            return True
+        return False
+
+    def entries(name, kind):
+        value = definition.get(name, kind())
+        if not isinstance(value, kind):
+            problems.append(f"{name} must be a{'n object' if kind is dict else ' list'}")
+            return kind()
+        return value
+
+    if not isinstance(definition, dict):
+        raise FrameworkError(None, ["definition must be an object"])
+
+    framework_id = definition.get("id")
+    if not isinstance(framework_id, str) or not framework_id:
+        problems.append("id must be a non-empty string")
+    if not definition.get("name"):
+        problems.append("name is required")
+
+    function_ids = set()
+    for func in entries("functions", list):
+        kind = f"function {func.get('id', '?') if isinstance(func, dict) else '?'}"
+        if malformed(kind, func, FUNCTION_FIELDS, FUNCTION_FIELDS):
+            continue
+        if func["id"] in function_ids:
+            problems.append(f"duplicate function {func['id']}")
+        function_ids.add(func["id"])
+    if not function_ids:
+        problems.append("at least one function is required")
+
+    question_ids = set()
+    categories = {}
+    for q in entries("questions", list):
+        kind = f"question {q.get('id', '?') if isinstance(q, dict) else '?'}"
+        if malformed(kind, q, QUESTION_FIELDS, QUESTION_FIELDS[1:]):
+            continue
+        # Drafts store answers under answers.<question id>, a MongoDB field path.
+        if not isinstance(q["id"], str) or not q["id"] or "." in q["id"] or q["id"].startswith("$"):
+            problems.append(f"question id {q['id']!r} must be a non-empty string without '.' or a leading '$'")
+            continue
+        if q["id"] in question_ids:
+            problems.append(f"duplicate question {q['id']}")
+        question_ids.add(q["id"])
+        if q["function"] not in function_ids:
+            problems.append(f"question {q['id']} references unknown function {q['function']}")
+        weight = q.get("weight", 1)
+        if not is_number(weight) or weight <= 0:
+            problems.append(f"question {q['id']} has invalid weight {weight!r}")
+        category = categories.setdefault(q["category"], (q["function"], q["category_name"]))
+        if category != (q["function"], q["category_name"]):
+            problems.append(f"category {q['category']} has inconsistent function or name at {q['id']}")
+    if not question_ids:
+        problems.append("at least one question is required")
+
+    levels = definition.get("maturity_levels", MATURITY_LEVELS)
+    if not isinstance(levels, dict) or sorted(str(level) for level in levels) != ["1", "2", "3", "4", "5"]:
+        problems.append("maturity_levels must define levels 1 to 5")
+
+    for func_id, func_categories in entries("action_templates", dict).items():
+        if not isinstance(func_categories, dict):
+            problems.append(f"action templates for {func_id} must be an object")
+            continue
+        for cat_code, cat_data in func_categories.items():
+            if malformed(f"action templates {func_id}/{cat_code}", cat_data, ("category_name", "actions"), ("category_name",)):
+                continue
+            if categories.get(cat_code, (None,))[0] != func_id:
+                problems.append(f"action templates reference unknown category {func_id}/{cat_code}")
+            if not isinstance(cat_data["actions"], list):
+                problems.append(f"action templates {func_id}/{cat_code} actions must be a list")
+                continue
+            for action in cat_data["actions"]:
+                where = f"action {func_id}/{cat_code}/{action.get('title', '?') if isinstance(action, dict) else '?'}"
+                if malformed(where, action, ACTION_FIELDS, ("severity", "title", "description", "timeline")):
+                    continue
+                if action["severity"] not in SEVERITY_ORDER:
+                    problems.append(f"{where} has unknown severity {action['severity']!r}")
+                # Thresholds are compared with category averages and sorted per category.
+                if not is_number(action["threshold"]):
+                    problems.append(f"{where} has non-numeric threshold {action['threshold']!r}")
+
+    for industry, data in entries("industry_recommendations", dict).items():
+        if malformed(f"industry {industry}", data, INDUSTRY_FIELDS, ("name", "code", "description")):
+            continue
+        if not isinstance(data["recommendations"], list):
+            problems.append(f"industry {industry} recommendations must be a list")
+            continue
+        for rec in data["recommendations"]:
+            if not isinstance(rec, dict) or rec.get("function") not in function_ids:
+                function = rec.get("function") if isinstance(rec, dict) else None
+                problems.append(f"industry {industry} recommends for unknown function {function}")
+
+    if problems:
+        raise FrameworkError(framework_id, problems)
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Framework:
+    """One validated framework, compiled for scoring and serving.
+
+    Everything is derived once from a private copy of the definition; treat
+    instances as read-only.
+    """
+
+    def __init__(self, definition):
+        validate_definition(definition)
+        definition = copy.deepcopy(definition)
+        self.id = definition["id"]
+        self.name = definition["name"]
+        self.functions = definition["functions"]
+        self.questions = definition["questions"]
+        self.maturity_levels = definition.get("maturity_levels", MATURITY_LEVELS)
+        self.action_templates = definition.get("action_templates", {})
+        self.industries = definition.get("industry_recommendations", {})
+
+        canonical = json.dumps(definition, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        self.version = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+        try:
+            self.index = FrameworkIndex(self.functions, self.questions)
+            self.actions = ActionIndex(self.action_templates)
+            self.engine = ScoringEngine(self.index)
+            self.catalog = build_catalog(self.functions, self.questions, self.maturity_levels, self.industries)
+        except (TypeError, KeyError, AttributeError, ValueError) as e:
+            # Anything validation let through must still fail as a definition error.
+            raise FrameworkError(self.id, [f"does not compile: {e!r}"]) from e
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "version": self.version,
+            "functions": len(self.index.functions),
+            "categories": len(self.index.category_codes),
+            "questions": self.index.num_questions,
+            "industries": list(self.industries),
+        }
+
+
+class FrameworkRegistry:
+    """Compiled frameworks by id, with one of them the default."""
+
+    def __init__(self, frameworks, default_id=BUILTIN_FRAMEWORK_ID):
+        self._frameworks = {}
+        for framework in frameworks:
+            if framework.id in self._frameworks:
+                raise FrameworkError(framework.id, ["framework id is registered twice"])
+            self._frameworks[framework.id] = framework
+        if default_id not in self._frameworks:
+            raise KeyError(f"Default framework {default_id!r} is not registered")
+        self.default = self._frameworks[default_id]
+        # (id, version) -> framework, including versions replaced by earlier
+        # reloads, so documents they scored still decode (see retain).
+        self._versions = {(framework.id, framework.version): framework for framework in frameworks}
+        # Question id -> ids of the frameworks that ask it.
+        self._question_frameworks = {}
+        for framework in self._frameworks.values():
+            for qid in framework.index.question_ids:
+                self._question_frameworks.setdefault(qid, []).append(framework.id)
+
+    def __iter__(self):
+        return iter(self._frameworks.values())
+
+    def __contains__(self, framework_id):
+        return framework_id in self._frameworks
+
+    def get(self, framework_id=None):
+        """The framework with this id, or the default for None; KeyError if unknown."""
+        if framework_id is None:
+            return self.default
+        return self._frameworks[framework_id]
+
+    def frameworks_with_question(self, question_id):
+        return self._question_frameworks.get(question_id, [])
+
+    def retain(self, previous):
+        """Keep every version previous knows of, for decoding documents they scored."""
+        for key, framework in previous._versions.items():
+            self._versions.setdefault(key, framework)
+
+    def version(self, framework_id, version):
+        """The exact framework version, or None if this process never compiled it."""
+        return self._versions.get((framework_id, version))
+
+
+def framework_query(framework_id):
+    """Mongo filter for documents scored against a framework.
+
+    Documents written before frameworks were recorded belong to the built-in one.
+    """
+    if framework_id == BUILTIN_FRAMEWORK_ID:
+        return {"framework_id": {"$in": [framework_id, None]}}
+    return {"framework_id": framework_id}
+
+
+def definition_files(directory):
+    if directory is None or not Path(directory).is_dir():
+        return []
+    return sorted(Path(directory).glob("*.json"))
+
+
+def load_registry(directory=None, default_id=BUILTIN_FRAMEWORK_ID):
+    """Compile every *.json definition in directory plus the built-in framework.
+
+    A file whose id is the built-in one takes the place of the data/ modules.
+    Raises FrameworkError or ValueError (bad JSON) without partial results.
+    """
+    frameworks = []
+    for path in definition_files(directory):
+        try:
+            definition = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as e:
+            raise ValueError(f"{path.name}: {e}") from e
+        frameworks.append(Framework(definition))
+    if not any(framework.id == BUILTIN_FRAMEWORK_ID for framework in frameworks):
+        frameworks.insert(0, Framework(builtin_definition()))
+    registry = FrameworkRegistry(frameworks, default_id)
+    for framework in registry:
+        logger.info("Loaded framework %s version %s (%d questions)",
+                    framework.id, framework.version, framework.index.num_questions)
+    return registry
+
+
+def directory_fingerprint(directory):
+    """Names, sizes and mtimes of the definition files, to detect edits."""
+    fingerprint = []
+    for path in definition_files(directory):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        fingerprint.append((path.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+async def watch(directory, interval, on_change):
+    """Call on_change() whenever the definition files change, until cancelled."""
+    last = directory_fingerprint(directory)
+    while True:
+        await asyncio.sleep(interval)
+        current = directory_fingerprint(directory)
+        if current == last:
+            continue
+        last = current
+        try:
+            await on_change()
+        except Exception:
+            logger.exception("Reloading frameworks from %s failed; keeping the loaded ones", directory)
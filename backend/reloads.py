@@ -0,0 +1,54 @@
+"""
+Framework reloads shared between worker processes.
+
+A reload only swaps the registry of the process that performs it. The
+process then bumps a generation counter in the framework_reloads
+collection, and every other worker polls that counter and reloads its own
+definitions when it moves, so all workers converge within one poll interval.
+"""
+
+import asyncio
+import logging
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+STATE_ID = "frameworks"
+
+
+class ReloadSignal:
+    """This process's view of the shared reload generation."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.generation = 0
+
+    async def current(self):
+        state = await self._collection.find_one({"_id": STATE_ID})
+        return state["generation"] if state else 0
+
+    async def load(self):
+        """Adopt the current generation; the definitions were just loaded from disk."""
+        self.generation = await self.current()
+
+    async def announce(self):
+        """Tell the other workers that this one reloaded."""
+        state = await self._collection.find_one_and_update(
+            {"_id": STATE_ID}, {"$inc": {"generation": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        self.generation = state["generation"]
+
+    async def follow(self, interval, on_reload):
+        """Call on_reload() whenever another worker announces a reload, until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                generation = await self.current()
+                if generation <= self.generation:
+                    continue
+                # Adopted before reloading, so a definition that fails here is not retried every poll.
+                self.generation = generation
+                await on_reload()
+            except Exception:
+                logger.exception("Following a framework reload by another worker failed; keeping the loaded ones")
@@ -0,0 +1,102 @@
+"""
+Materialized score rollups per industry.
+
+Each worker accumulates count / sum / sum of squares and maturity-label
+counts for the overall, per-function and per-category score_pct of every
+new submission. A background task folds those deltas into the rollups
+collection with a single pipeline update per industry, which also
+recomputes the stored mean and variance atomically. Dashboards read the
+documents as-is instead of aggregating the assessments collection.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from aggregates import DeltaAggregator
+from benchmarks import _category_key
+from framework import FRAMEWORK_INDEX
+from scoring import MATURITY_LABELS
+
+ALL_INDUSTRIES = "all"
+
+
+class RollupAggregator(DeltaAggregator):
+    """Per-industry rollup deltas waiting to be merged into Mongo."""
+
+    failure = "Failed to update score rollups"
+
+    def __init__(self, collection, industries, index=FRAMEWORK_INDEX):
+        super().__init__()
+        self.collection = collection
+        self.industries = set(industries)
+        self.index = index
+        self.paths = (
+            ["overall"]
+            + [f"functions.{fid}" for fid in index.function_ids]
+            + [f"categories.{_category_key(code)}" for code in index.category_codes]
+        )
+        self._function_row = {fid: 1 + i for i, fid in enumerate(index.function_ids)}
+        self._category_row = {code: 1 + len(index.function_ids) + i for i, code in enumerate(index.category_codes)}
+        self._label_col = {label: i for i, label in enumerate(MATURITY_LABELS)}
+
+    def _delta(self, key):
+        delta = self._pending.get(key)
+        if delta is None:
+            # Columns: count, sum, sum of squares, then one count per maturity label.
+            delta = self._pending[key] = np.zeros((len(self.paths), 3 + len(MATURITY_LABELS)))
+        return delta
+
+    def add(self, industry, result):
+        rows = [(0, result["overall_score"], result["overall_maturity"])]
+        rows += [
+            (self._function_row[fid], data["score_pct"], data["maturity"])
+            for fid, data in result["function_scores"].items()
+        ]
+        rows += [
+            (self._category_row[code], data["score_pct"], data["maturity"])
+            for code, data in result["category_scores"].items()
+        ]
+        keys = [ALL_INDUSTRIES] + ([industry] if industry in self.industries else [])
+        for key in keys:
+            delta = self._delta(key)
+            for row, score, label in rows:
+                delta[row, 0] += 1
+                delta[row, 1] += score
+                delta[row, 2] += score * score
+                delta[row, 3 + self._label_col[label]] += 1
+
+    def _pipeline(self, industry, delta):
+        def add(field, amount):
+            return {"$add": [{"$ifNull": [f"${field}", 0]}, amount]}
+
+        totals = {}
+        stats = {}
+        for row in np.flatnonzero(delta[:, 0]).tolist():
+            path = self.paths[row]
+            count, total, total_sq = delta[row, :3].tolist()
+            totals[f"{path}.count"] = add(f"{path}.count", int(count))
+            totals[f"{path}.sum"] = add(f"{path}.sum", total)
+            totals[f"{path}.sum_sq"] = add(f"{path}.sum_sq", total_sq)
+            for col, label in enumerate(MATURITY_LABELS):
+                n = int(delta[row, 3 + col])
+                if n:
+                    totals[f"{path}.maturity.{label}"] = add(f"{path}.maturity.{label}", n)
+            mean = {"$divide": [f"${path}.sum", f"${path}.count"]}
+            stats[f"{path}.mean"] = mean
+            stats[f"{path}.variance"] = {
+                "$max": [0, {"$subtract": [{"$divide": [f"${path}.sum_sq", f"${path}.count"]}, {"$multiply": [mean, mean]}]}]
+            }
+        totals.update({
+            "industry": industry,
+            "framework_version": self.index.version,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        })
+        return [{"$set": totals}, {"$set": stats}]
+
+    async def _merge(self, industry, delta):
+        await self.collection.update_one(
+            {"_id": f"{industry}:{self.index.version}"},
+            self._pipeline(industry, delta),
+            upsert=True,
+        )
@@ -0,0 +1,170 @@
+"""
+Vectorized scoring engine.
+Scores an N x Q matrix of answers (0 = unanswered) in one pass using
+weight and membership matrices derived from the compiled framework index.
+"""
+
+import numpy as np
+
+from framework import FRAMEWORK_INDEX
+
+MATURITY_LABELS = ("Initial", "Developing", "Defined", "Managed", "Optimizing")
+MATURITY_BOUNDS = np.array([1.5, 2.5, 3.5, 4.5])
+
+
+def get_maturity_label(avg_score):
+    if avg_score <= 1.5:
+        return "Initial"
+    elif avg_score <= 2.5:
+        return "Developing"
+    elif avg_score <= 3.5:
+        return "Defined"
+    elif avg_score <= 4.5:
+        return "Managed"
+    return "Optimizing"
+
+
+def maturity_indices(avg_scores):
+    """Vectorized get_maturity_label, returning indices into MATURITY_LABELS."""
+    return np.searchsorted(MATURITY_BOUNDS, avg_scores, side="left")
+
+
+def _round1(values):
+    """Round to one decimal exactly like the builtin round(x, 1).
+
+    round() rounds the exact binary value of x, while np.rint(x * 10) sees the
+    product after it has been rounded to a double. The two only disagree when
+    x * 10 lands exactly on a .5 tie, so for those entries the exact rounding
+    error of the product (Dekker's two-product) decides the direction.
+    """
+    scaled = values * 10
+    rounded = np.rint(scaled)
+    tie = scaled - np.floor(scaled) == 0.5
+    if tie.any():
+        x, product = values[tie], scaled[tie]
+        split = 134217729.0 * x
+        high = split - (split - x)
+        low = x - high
+        error = (high * 10 - product) + low * 10
+        rounded[tie] = np.where(error > 0, np.ceil(product),
+                                np.where(error < 0, np.floor(product), rounded[tie]))
+    return rounded / 10
+
+
+def _ratio(total, max_total, scale):
+    out = np.zeros(total.shape)
+    np.divide(total, max_total, out=out, where=max_total > 0)
+    return _round1(out * scale)
+
+
+class BatchScores:
+    """Scores for N assessments, one row per assessment."""
+
+    def __init__(self, index, overall_pct, overall_avg, function_pct, function_avg,
+                 category_pct, category_avg, category_answered):
+        self.index = index
+        self.overall_pct = overall_pct
+        self.overall_avg = overall_avg
+        self.function_pct = function_pct
+        self.function_avg = function_avg
+        self.category_pct = category_pct
+        self.category_avg = category_avg
+        self.category_answered = category_answered
+
+    def __len__(self):
+        return len(self.overall_pct)
+
+    def rows(self):
+        """Yield (overall_pct, overall_avg, function_scores, category_scores) per row.
+
+        The tuples have the same shape as calculate_scores' return value.
+        """
+        index = self.index
+        function_labels = maturity_indices(self.function_avg).tolist()
+        category_labels = maturity_indices(self.category_avg).tolist()
+        columns = zip(
+            self.overall_pct.tolist(), self.overall_avg.tolist(),
+            self.function_pct.tolist(), self.function_avg.tolist(), function_labels,
+            self.category_pct.tolist(), self.category_avg.tolist(), category_labels,
+            self.category_answered.tolist(),
+        )
+        for (overall_pct, overall_avg, func_pct, func_avg, func_label,
+             cat_pct, cat_avg, cat_label, cat_answered) in columns:
+            function_scores = {}
+            for func_idx, func in enumerate(index.functions):
+                function_scores[func["id"]] = {
+                    "name": func["name"],
+                    "code": func["code"],
+                    "score_pct": func_pct[func_idx],
+                    "avg_score": func_avg[func_idx],
+                    "maturity": MATURITY_LABELS[func_label[func_idx]],
+                    "color": func["color"],
+                }
+            category_scores = {}
+            for cat_idx, cat in enumerate(index.category_codes):
+                if not cat_answered[cat_idx]:
+                    continue
+                category_scores[cat] = {
+                    "name": index.category_names[cat_idx],
+                    "function": index.function_ids[index.category_function[cat_idx]],
+                    "score_pct": cat_pct[cat_idx],
+                    "avg_score": cat_avg[cat_idx],
+                    "maturity": MATURITY_LABELS[cat_label[cat_idx]],
+                }
+            yield overall_pct, overall_avg, function_scores, category_scores
+
+
+class ScoringEngine:
+    """Weight and membership matrices for one compiled framework."""
+
+    def __init__(self, index):
+        self.index = index
+        self.weights = np.array(index.weights, dtype=np.float64)
+        num_questions = index.num_questions
+        self.function_membership = np.zeros((num_questions, len(index.functions)))
+        self.function_membership[np.arange(num_questions), index.question_function] = 1
+        self.category_membership = np.zeros((num_questions, len(index.category_codes)))
+        self.category_membership[np.arange(num_questions), index.question_category] = 1
+
+    def answers_to_matrix(self, answer_sets):
+        """Pack lists of AssessmentAnswer into an N x Q uint8 score matrix."""
+        matrix = np.zeros((len(answer_sets), self.index.num_questions), dtype=np.uint8)
+        for row, answers in enumerate(answer_sets):
+            matrix[row] = self.index.score_vector(answers)
+        return matrix
+
+    def score_matrix(self, matrix):
+        """Score every row of an N x Q answer matrix (0 = unanswered)."""
+        scores = np.asarray(matrix, dtype=np.float64)
+        if scores.ndim != 2 or scores.shape[1] != self.index.num_questions:
+            raise ValueError(
+                f"expected an N x {self.index.num_questions} answer matrix, got shape {scores.shape}"
+            )
+        answered = scores > 0
+        weighted = scores * self.weights
+        weighted_max = answered * (5 * self.weights)
+
+        func_total = weighted @ self.function_membership
+        func_max = weighted_max @ self.function_membership
+        cat_total = weighted @ self.category_membership
+        cat_max = weighted_max @ self.category_membership
+
+        total_score = scores.sum(axis=1)
+        max_score = answered.sum(axis=1) * 5.0
+
+        return BatchScores(
+            self.index,
+            overall_pct=_ratio(total_score, max_score, 100),
+            overall_avg=_ratio(total_score, max_score, 5),
+            function_pct=_ratio(func_total, func_max, 100),
+            function_avg=_ratio(func_total, func_max, 5),
+            category_pct=_ratio(cat_total, cat_max, 100),
+            category_avg=_ratio(cat_total, cat_max, 5),
+            category_answered=cat_max > 0,
+        )
+
+    def score_answer_sets(self, answer_sets):
+        return self.score_matrix(self.answers_to_matrix(answer_sets))
+
+
+SCORING_ENGINE = ScoringEngine(FRAMEWORK_INDEX)
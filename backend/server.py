@@ -1,26 +1,123 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, Depends, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, ValidationError
+from pymongo.errors import BulkWriteError
 from typing import List, Dict, Optional
+from contextlib import contextmanager
+import hashlib
+import secrets
+import threading
+import time
 import uuid
 from datetime import datetime, timezone
 
-from data.questions import QUESTIONS, FUNCTIONS, MATURITY_LEVELS
-from data.recommendations import INDUSTRY_RECOMMENDATIONS
-from data.actions import ACTION_TEMPLATES
+from cache import TTLCache
+from benchmarks import BenchmarkStore
+from export import FORMATS as EXPORT_FORMATS, open_cursor as open_export_cursor, stream as stream_export
+from idempotency import IDEMPOTENCY_WINDOW_SECONDS, claim as claim_submission, release as release_submission, request_hash, submission_key
+from indexes import ensure_indexes
+from scoring import MATURITY_LABELS, get_maturity_label
+from live import LiveScorer
+from profiler import AllocationTracker, StackSampler
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, METRICS, STAGE_LATENCY, SUBMISSIONS, MetricsMiddleware
+from listing import (
+    OPTIONAL_FIELDS as LIST_OPTIONAL_FIELDS,
+    build_projection as build_list_projection,
+    build_query as build_list_query,
+    encode_cursor,
+    to_list_item,
+)
+from registry import BUILTIN_FRAMEWORK_ID, framework_query, load_registry, watch as watch_frameworks
+from rollups import ALL_INDUSTRIES, RollupAggregator
+from snapshot import SnapshotReader
+from storage import RESULT_PROJECTION, to_document, from_document
+from reloads import ReloadSignal
+from versions import FrameworkVersions
+from tracing import FileExporter, MongoSpanListener, RingBufferExporter, Tracer, TracingMiddleware
+from write_behind import WriteBehindQueue
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Sampled requests record spans for the handler, its stages and every Mongo
+# command. TRACE_EXPORTER is "memory" (ring buffer behind /api/admin/traces),
+# "file" (OTLP/JSON lines) or "none".
+TRACE_EXPORTER = os.environ.get('TRACE_EXPORTER', 'memory')
+if TRACE_EXPORTER == 'memory':
+    trace_exporter = RingBufferExporter(int(os.environ.get('TRACE_BUFFER_SIZE', '200')))
+elif TRACE_EXPORTER == 'file':
+    trace_exporter = FileExporter(os.environ.get('TRACE_FILE', ROOT_DIR / 'traces.jsonl'), 'nist-rmf-backend')
+else:
+    trace_exporter = None
+TRACER = Tracer(trace_exporter, float(os.environ.get('TRACE_SAMPLE_RATE', '0')))
+
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoSpanListener(TRACER)])
 db = client[os.environ['DB_NAME']]
 
+# Admin endpoints are disabled unless a token is configured.
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# All frameworks are compiled up front; requests only look them up by id.
+# A reload compiles a new registry and rebinds these two names (see
+# install_frameworks), so a handler never sees a half-updated registry.
+FRAMEWORKS_DIR = os.environ.get('FRAMEWORKS_DIR', ROOT_DIR / 'frameworks')
+DEFAULT_FRAMEWORK_ID = os.environ.get('DEFAULT_FRAMEWORK', BUILTIN_FRAMEWORK_ID)
+FRAMEWORK_WATCH_SECONDS = float(os.environ.get('FRAMEWORK_WATCH_SECONDS', '0'))
+FRAMEWORK_SYNC_SECONDS = float(os.environ.get('FRAMEWORK_SYNC_SECONDS', '5'))
+FRAMEWORKS = load_registry(FRAMEWORKS_DIR, DEFAULT_FRAMEWORK_ID)
+DEFAULT_FRAMEWORK = FRAMEWORKS.default
+framework_reload_lock = asyncio.Lock()
+# Reloads requested through the API are announced here and followed by every other worker.
+FRAMEWORK_RELOADS = ReloadSignal(db.framework_reloads)
+profile_lock = asyncio.Lock()
+
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', '1000'))
+
+RESULT_CACHE = TTLCache(
+    maxsize=int(os.environ.get('RESULT_CACHE_SIZE', '10000')),
+    ttl=float(os.environ.get('RESULT_CACHE_TTL', '3600')),
+)
+RESULT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Scored fields (everything derived from the answers) keyed by answer vector.
+SCORE_MEMO = TTLCache(
+    maxsize=int(os.environ.get('SCORE_MEMO_SIZE', '10000')),
+    ttl=float(os.environ.get('SCORE_MEMO_TTL', '3600')),
+)
+
+# Optional write-behind mode: submissions are acknowledged once queued and
+# stay readable from the queue until the batch reaches Mongo.
+WRITE_QUEUE = None
+if os.environ.get('WRITE_BEHIND', 'false').lower() in ('1', 'true', 'yes'):
+    WRITE_QUEUE = WriteBehindQueue(
+        db.assessments,
+        max_batch=int(os.environ.get('WRITE_BEHIND_BATCH', '500')),
+        max_delay=float(os.environ.get('WRITE_BEHIND_DELAY_MS', '50')) / 1000,
+        max_pending=int(os.environ.get('WRITE_BEHIND_MAX_PENDING', '10000')),
+    )
+
+# Benchmarks, rollups and snapshots cover assessments of the default framework.
+BENCHMARKS = BenchmarkStore(db.benchmarks, DEFAULT_FRAMEWORK.industries, DEFAULT_FRAMEWORK.index)
+BENCHMARK_FLUSH_SECONDS = float(os.environ.get('BENCHMARK_FLUSH_SECONDS', '60'))
+
+ROLLUPS = RollupAggregator(db.rollups, DEFAULT_FRAMEWORK.industries, DEFAULT_FRAMEWORK.index)
+ROLLUP_FLUSH_SECONDS = float(os.environ.get('ROLLUP_FLUSH_SECONDS', '10'))
+
+# Layouts and action templates of every framework version that scored a stored assessment.
+FRAMEWORK_VERSIONS = FrameworkVersions(db.framework_versions)
+
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '1000'))
+
+SNAPSHOTS = SnapshotReader(os.environ.get('SNAPSHOT_DIR', ROOT_DIR / 'snapshots'), DEFAULT_FRAMEWORK.index)
+
 app = FastAPI()
 api_router = APIRouter(prefix="/api")
 
@@ -34,12 +131,30 @@ class AssessmentSubmission(BaseModel):
     industry: str
     organization_name: Optional[str] = "Anonymous"
     answers: List[AssessmentAnswer]
+    # Framework id; the default framework when omitted.
+    framework: Optional[str] = None
+
+class DraftCreate(BaseModel):
+    industry: str
+    organization_name: Optional[str] = "Anonymous"
+    framework: Optional[str] = None
+
+class DraftFinalize(BaseModel):
+    # Answers the client holds; they override the saved ones, so an answer
+    # whose autosave failed is still scored.
+    answers: List[AssessmentAnswer] = []
+
+class AssessmentBatch(BaseModel):
+    # Items are validated one by one so a bad entry is reported, not fatal.
+    assessments: List[Dict]
 
 class AssessmentResult(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str
     industry: str
     organization_name: str
+    framework_id: str
+    framework_version: str
     overall_score: float
     overall_maturity: str
     function_scores: Dict
@@ -50,77 +165,55 @@ class AssessmentResult(BaseModel):
 
 
 # ---- Helper Functions ----
-def calculate_scores(answers: List[AssessmentAnswer]):
-    answer_map = {a.question_id: a.score for a in answers}
-    function_scores = {}
-    category_scores = {}
-
-    for func in FUNCTIONS:
-        func_id = func["id"]
-        func_questions = [q for q in QUESTIONS if q["function"] == func_id]
-        if not func_questions:
-            continue
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
 
-        func_total = 0
-        func_weight = 0
-        cat_groups = {}
 
-        for q in func_questions:
-            score = answer_map.get(q["id"], 0)
-            if score == 0:
-                continue
-            weight = q.get("weight", 1)
-            func_total += score * weight
-            func_weight += 5 * weight
-
-            cat = q["category"]
-            if cat not in cat_groups:
-                cat_groups[cat] = {"total": 0, "max": 0, "name": q["category_name"], "scores": []}
-            cat_groups[cat]["total"] += score * weight
-            cat_groups[cat]["max"] += 5 * weight
-            cat_groups[cat]["scores"].append(score)
-
-        func_pct = round((func_total / func_weight * 100) if func_weight > 0 else 0, 1)
-        func_avg = round((func_total / func_weight * 5) if func_weight > 0 else 0, 1)
-        function_scores[func_id] = {
-            "name": func["name"],
-            "code": func["code"],
-            "score_pct": func_pct,
-            "avg_score": func_avg,
-            "maturity": get_maturity_label(func_avg),
-            "color": func["color"],
-        }
+def get_framework(framework_id: Optional[str], status_code=404):
+    try:
+        return FRAMEWORKS.get(framework_id)
+    except KeyError:
+        raise HTTPException(status_code=status_code, detail=f"Framework '{framework_id}' not found")
+
+
+def stored_framework(doc):
+    """Framework a stored document was scored with; pre-registry documents used the built-in one.
+
+    Documents scored before a reload get the version that scored them, whose
+    answer layout and action ids match what was stored.
+    """
+    framework_id = doc.get("framework_id", BUILTIN_FRAMEWORK_ID)
+    framework = FRAMEWORKS.version(framework_id, doc.get("framework_version"))
+    if framework is not None:
+        return framework
+    if framework_id in FRAMEWORKS:
+        return FRAMEWORKS.get(framework_id)
+    return DEFAULT_FRAMEWORK
 
-        for cat, data in cat_groups.items():
-            cat_pct = round((data["total"] / data["max"] * 100) if data["max"] > 0 else 0, 1)
-            cat_avg = round((data["total"] / data["max"] * 5) if data["max"] > 0 else 0, 1)
-            category_scores[cat] = {
-                "name": data["name"],
-                "function": func_id,
-                "score_pct": cat_pct,
-                "avg_score": cat_avg,
-                "maturity": get_maturity_label(cat_avg),
-            }
 
-    total_answered = sum(1 for a in answers if a.score > 0)
-    total_score = sum(a.score for a in answers)
-    max_score = total_answered * 5
-    overall_pct = round((total_score / max_score * 100) if max_score > 0 else 0, 1)
-    overall_avg = round((total_score / max_score * 5) if max_score > 0 else 0, 1)
+def stored_decoders(doc):
+    """(index, actions) to decode a stored document's answers and priority actions with.
 
-    return overall_pct, overall_avg, function_scores, category_scores
+    Call FRAMEWORK_VERSIONS.resolve() on the documents first, so versions
+    recorded by other workers or earlier runs are known.
+    """
+    framework = stored_framework(doc)
+    return FRAMEWORK_VERSIONS.decoders(doc, framework.index, framework.actions)
 
 
-def get_maturity_label(avg_score):
-    if avg_score <= 1.5:
-        return "Initial"
-    elif avg_score <= 2.5:
-        return "Developing"
-    elif avg_score <= 3.5:
-        return "Defined"
-    elif avg_score <= 4.5:
-        return "Managed"
-    return "Optimizing"
+@contextmanager
+def stage(route, name):
+    """Time one handler stage into STAGE_LATENCY and trace it as a span."""
+    with TRACER.span(name, route=route), STAGE_LATENCY.time(route, name):
+        yield
+
+
+def calculate_scores(answers: List[AssessmentAnswer], framework=None):
+    engine = (framework or DEFAULT_FRAMEWORK).engine
+    return next(engine.score_answer_sets([answers]).rows())
 
 
 def build_radar_data(function_scores):
@@ -134,31 +227,210 @@ def build_radar_data(function_scores):
     ]
 
 
-def generate_priority_actions(category_scores, answer_map):
-    actions = []
-    for func_id, categories in ACTION_TEMPLATES.items():
-        for cat_code, cat_data in categories.items():
-            cat_score = category_scores.get(cat_code, {})
-            avg = cat_score.get("avg_score", 0)
-            for action in cat_data["actions"]:
-                if avg < action["threshold"]:
-                    actions.append({
-                        "id": str(uuid.uuid4())[:8],
-                        "function": func_id,
-                        "category": cat_code,
-                        "category_name": cat_data["category_name"],
-                        "severity": action["severity"],
-                        "title": action["title"],
-                        "description": action["description"],
-                        "timeline": action["timeline"],
-                        "resources": action["resources"],
-                        "current_score": avg,
-                        "target_score": action["threshold"],
-                    })
-
-    severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-    actions.sort(key=lambda x: (severity_order.get(x["severity"], 99), x.get("current_score", 0)))
-    return actions
+def generate_priority_actions(category_scores, framework=None):
+    return (framework or DEFAULT_FRAMEWORK).actions.generate(category_scores)
+
+
+def build_scored_fields(framework, scores, route="submit"):
+    overall_pct, overall_avg, function_scores, category_scores = scores
+    with stage(route, "build_radar_data"):
+        radar_data = build_radar_data(function_scores)
+    with stage(route, "generate_priority_actions"):
+        priority_actions = generate_priority_actions(category_scores, framework)
+    return {
+        "overall_score": overall_pct,
+        "overall_maturity": get_maturity_label(overall_avg),
+        "function_scores": function_scores,
+        "category_scores": category_scores,
+        "radar_data": radar_data,
+        "priority_actions": priority_actions,
+    }
+
+
+def score_memo_key(framework, vector):
+    digest = hashlib.blake2b(vector.tobytes(), digest_size=16).hexdigest()
+    return f"{framework.id}:{framework.version}:{digest}"
+
+
+def score_submissions(submissions, route="submit"):
+    """Scored fields for each submission, reusing SCORE_MEMO where possible.
+
+    Submissions must name registered frameworks. Only answer vectors missing
+    from the memo go through the scoring pipeline, in one batch per
+    framework, and only those show up in the scoring stage timings for
+    route. The returned dicts may be shared between results and must not
+    be mutated.
+    """
+    by_framework = {}
+    for i, submission in enumerate(submissions):
+        by_framework.setdefault(submission.framework, []).append(i)
+
+    scored = [None] * len(submissions)
+    for framework_id, positions in by_framework.items():
+        framework = FRAMEWORKS.get(framework_id)
+        matrix = framework.engine.answers_to_matrix([submissions[i].answers for i in positions])
+        keys = [score_memo_key(framework, row) for row in matrix]
+        # Identical vectors within one batch are scored once.
+        misses = {}
+        for row, (i, key) in enumerate(zip(positions, keys)):
+            scored[i] = SCORE_MEMO.get(key)
+            if scored[i] is None:
+                misses.setdefault(key, row)
+        if not misses:
+            continue
+        fresh = {}
+        with stage(route, "calculate_scores"):
+            rows = list(framework.engine.score_matrix(matrix[list(misses.values())]).rows())
+        for key, scores in zip(misses, rows):
+            fresh[key] = build_scored_fields(framework, scores, route)
+            SCORE_MEMO.set(key, fresh[key])
+        for i, key in zip(positions, keys):
+            if scored[i] is None:
+                scored[i] = fresh[key]
+    return scored
+
+
+def build_assessment_result(submission: AssessmentSubmission, scored, assessment_id=None):
+    framework = FRAMEWORKS.get(submission.framework)
+    return {
+        "id": assessment_id or str(uuid.uuid4()),
+        "industry": submission.industry,
+        "organization_name": submission.organization_name,
+        "framework_id": framework.id,
+        "framework_version": framework.version,
+        **scored,
+        "answers": [a.model_dump() for a in submission.answers],
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def record_result(result, index):
+    """Feed a newly stored result, scored with index, to the read cache, the aggregates and the metrics."""
+    RESULT_CACHE.set(result["id"], result)
+    # Industries outside the framework share a label to keep the series bounded.
+    industry = result["industry"] if result["industry"] in stored_framework(result).industries else "other"
+    SUBMISSIONS.inc(industry, result["framework_id"])
+    # A reload during the insert may have rebuilt the stores for another layout.
+    if result["framework_id"] == DEFAULT_FRAMEWORK.id and index.version == BENCHMARKS.index.version:
+        BENCHMARKS.add(result["industry"], result)
+        ROLLUPS.add(result["industry"], result)
+
+
+async def store_result(result, route="submit"):
+    """Persist a freshly built result and strip the answers from it."""
+    framework = FRAMEWORKS.get(result["framework_id"])
+    index = framework.index
+    await FRAMEWORK_VERSIONS.record([framework])
+    doc = to_document(result, index)
+    if WRITE_QUEUE is not None:
+        with stage(route, "write_queue_put"):
+            await WRITE_QUEUE.put(doc)
+    else:
+        with stage(route, "mongo_insert"):
+            await db.assessments.insert_one(doc)
+
+    del result["answers"]
+    record_result(result, index)
+
+
+async def write_draft_answer(draft_id, answer, query=None):
+    """Set one answer on a draft; returns False if no draft matched."""
+    result = await db.drafts.update_one(
+        {"_id": draft_id, **(query or {})},
+        {"$set": {f"answers.{answer.question_id}": answer.score, "updated_at": datetime.now(timezone.utc)}},
+    )
+    return result.matched_count > 0
+
+
+def json_response(result, route, headers=None):
+    """Serialize result inside the handler so the serialization stage can be timed."""
+    with stage(route, "serialization"):
+        return JSONResponse(result, headers=headers)
+
+
+def observe_validation(request, route):
+    """Time from the request arriving to the handler running: body read and model validation."""
+    STAGE_LATENCY.observe(time.perf_counter() - request.state.started_at, route, "validation")
+
+
+def draft_response(draft):
+    return {
+        "id": draft["_id"],
+        "industry": draft["industry"],
+        "organization_name": draft["organization_name"],
+        "framework_id": draft.get("framework_id", BUILTIN_FRAMEWORK_ID),
+        "answers": draft.get("answers", {}),
+        "created_at": draft["created_at"],
+        "updated_at": draft["updated_at"].replace(tzinfo=timezone.utc).isoformat(),
+    }
+
+
+def aggregates_for(framework):
+    """Whether the benchmark/rollup stores were built for this framework's layout."""
+    return (BENCHMARKS.index.version == framework.index.version
+            and BENCHMARKS.industries == set(framework.industries))
+
+
+async def install_frameworks(registry):
+    """Make registry the live one and drop everything derived from the old one."""
+    global FRAMEWORKS, DEFAULT_FRAMEWORK, BENCHMARKS, ROLLUPS, SNAPSHOTS, benchmark_task, rollup_task
+    old_tasks = []
+    # No awaits until every reference is swapped, so no code ever sees a half-installed registry.
+    # Requests that await across the swap do see both; record_result checks the layout it scored with.
+    registry.retain(FRAMEWORKS)
+    FRAMEWORKS, DEFAULT_FRAMEWORK = registry, registry.default
+    SCORE_MEMO.clear()
+    if not aggregates_for(DEFAULT_FRAMEWORK):
+        old_tasks = [task for task in (benchmark_task, rollup_task) if task is not None]
+        BENCHMARKS = BenchmarkStore(db.benchmarks, DEFAULT_FRAMEWORK.industries, DEFAULT_FRAMEWORK.index)
+        ROLLUPS = RollupAggregator(db.rollups, DEFAULT_FRAMEWORK.industries, DEFAULT_FRAMEWORK.index)
+        SNAPSHOTS = SnapshotReader(SNAPSHOTS.root, DEFAULT_FRAMEWORK.index)
+        benchmark_task = rollup_task = None
+
+    if old_tasks:
+        # Cancelling flushes what the old stores still hold.
+        for task in old_tasks:
+            task.cancel()
+        await asyncio.gather(*old_tasks, return_exceptions=True)
+        await BENCHMARKS.load()
+        benchmark_task = asyncio.create_task(BENCHMARKS.run(BENCHMARK_FLUSH_SECONDS))
+        rollup_task = asyncio.create_task(ROLLUPS.run(ROLLUP_FLUSH_SECONDS))
+
+
+async def reload_frameworks():
+    """Recompile the framework definitions off the event loop and install them."""
+    async with framework_reload_lock:
+        previous = {framework.id: framework.version for framework in FRAMEWORKS}
+        registry = await asyncio.to_thread(load_registry, FRAMEWORKS_DIR, DEFAULT_FRAMEWORK_ID)
+        await install_frameworks(registry)
+        changed = sorted(
+            framework.id for framework in registry if previous.get(framework.id) != framework.version
+        )
+        removed = sorted(set(previous) - {framework.id for framework in registry})
+        logger.info("Reloaded frameworks; changed: %s, removed: %s", changed or "none", removed or "none")
+        return {"changed": changed, "removed": removed}
+
+
+async def load_assessment(assessment_id: str, route="get"):
+    result = RESULT_CACHE.get(assessment_id)
+    if result is not None:
+        return result
+    if WRITE_QUEUE is not None:
+        queued = WRITE_QUEUE.get(assessment_id)
+        if queued is not None:
+            result = {key: value for key, value in queued.items() if key not in RESULT_PROJECTION}
+            return from_document(result, stored_decoders(result)[1])
+    with stage(route, "mongo_find"):
+        result = await db.assessments.find_one(
+            {"_id": assessment_id},
+            RESULT_PROJECTION
+        )
+    if not result:
+        return None
+    await FRAMEWORK_VERSIONS.resolve([result])
+    result = from_document(result, stored_decoders(result)[1])
+    RESULT_CACHE.set(assessment_id, result)
+    return result
 
 
 # ---- Routes ----
@@ -166,77 +438,405 @@ def generate_priority_actions(category_scores, answer_map):
 async def root():
     return {"message": "NIST AI RMF Assessment API"}
 
-@api_router.get("/assessment/questions")
-async def get_questions():
+@api_router.get("/frameworks")
+async def list_frameworks():
     return {
-        "functions": FUNCTIONS,
-        "questions": QUESTIONS,
-        "maturity_levels": MATURITY_LEVELS,
-        "total_questions": len(QUESTIONS),
+        "default": DEFAULT_FRAMEWORK.id,
+        "frameworks": [framework.summary() for framework in FRAMEWORKS],
     }
 
+@api_router.get("/assessment/questions")
+async def get_questions(request: Request, framework: Optional[str] = None):
+    return get_framework(framework).catalog["questions"].response(request)
+
 @api_router.get("/assessment/industries")
-async def get_industries():
-    industries = []
-    for key, val in INDUSTRY_RECOMMENDATIONS.items():
-        industries.append({
-            "id": key,
-            "name": val["name"],
-            "code": val["code"],
-            "regulations": val["regulations"],
-            "description": val["description"],
-        })
-    return {"industries": industries}
+async def get_industries(request: Request, framework: Optional[str] = None):
+    return get_framework(framework).catalog["industries"].response(request)
 
 @api_router.post("/assessment/submit")
-async def submit_assessment(submission: AssessmentSubmission):
-    answer_map = {a.question_id: a.score for a in submission.answers}
-    overall_pct, overall_avg, function_scores, category_scores = calculate_scores(submission.answers)
-
-    radar_data = build_radar_data(function_scores)
-    priority_actions = generate_priority_actions(category_scores, answer_map)
-
+async def submit_assessment(
+    submission: AssessmentSubmission,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+):
+    observe_validation(request, "submit")
+    framework = get_framework(submission.framework, status_code=422)
+    digest = key = None
+    if IDEMPOTENCY_WINDOW_SECONDS > 0:
+        digest = request_hash(submission, framework)
+        key = submission_key(submission, framework, digest, idempotency_key)
+    if key is None:
+        result = build_assessment_result(submission, score_submissions([submission])[0])
+        await store_result(result)
+        return json_response(result, "submit")
+
+    # Claim the key before scoring so repeats never score or insert again.
     assessment_id = str(uuid.uuid4())
-    now = datetime.now(timezone.utc).isoformat()
-
-    result = {
-        "id": assessment_id,
-        "industry": submission.industry,
-        "organization_name": submission.organization_name,
-        "overall_score": overall_pct,
-        "overall_maturity": get_maturity_label(overall_avg),
-        "function_scores": function_scores,
-        "category_scores": category_scores,
-        "radar_data": radar_data,
-        "priority_actions": priority_actions,
-        "answers": [a.model_dump() for a in submission.answers],
-        "created_at": now,
-    }
+    with stage("submit", "idempotency_claim"):
+        existing = await claim_submission(db.submission_keys, key, assessment_id, digest)
+    if existing is not None:
+        if existing.get("request_hash") != digest:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different submission")
+        original = await load_assessment(existing["assessment_id"], "submit")
+        if original is None:
+            raise HTTPException(status_code=409, detail="An identical submission is still being processed")
+        return json_response(original, "submit", {"Idempotent-Replayed": "true"})
+
+    result = build_assessment_result(submission, score_submissions([submission])[0], assessment_id)
+    try:
+        await store_result(result)
+    except Exception:
+        await release_submission(db.submission_keys, key, assessment_id)
+        raise
+    return json_response(result, "submit")
+
+@api_router.post("/assessment/submit-batch")
+async def submit_assessment_batch(batch: AssessmentBatch):
+    if len(batch.assessments) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds the maximum of {MAX_BATCH_SIZE} assessments",
+        )
+
+    items = [None] * len(batch.assessments)
+    valid = []
+    for position, raw in enumerate(batch.assessments):
+        try:
+            submission = AssessmentSubmission.model_validate(raw)
+        except ValidationError as e:
+            items[position] = {
+                "index": position,
+                "status": "invalid",
+                "errors": [{"loc": err["loc"], "msg": err["msg"]} for err in e.errors()],
+            }
+            continue
+        if submission.framework is not None and submission.framework not in FRAMEWORKS:
+            items[position] = {
+                "index": position,
+                "status": "invalid",
+                "errors": [{"loc": ["framework"], "msg": f"Framework '{submission.framework}' not found"}],
+            }
+            continue
+        valid.append((position, submission))
 
-    await db.assessments.insert_one({**result, "_id": assessment_id})
+    scored = score_submissions([s for _, s in valid], "submit_batch")
+    results = [
+        build_assessment_result(submission, fields)
+        for (_, submission), fields in zip(valid, scored)
+    ]
 
-    del result["answers"]
-    return result
+    frameworks = [FRAMEWORKS.get(result["framework_id"]) for result in results]
+    indexes = [framework.index for framework in frameworks]
+    failed_writes = {}
+    if results:
+        await FRAMEWORK_VERSIONS.record(frameworks)
+        try:
+            await db.assessments.insert_many(
+                [to_document(result, index) for result, index in zip(results, indexes)],
+                ordered=False,
+            )
+        except BulkWriteError as e:
+            failed_writes = {err["index"]: err.get("errmsg", "write failed") for err in e.details["writeErrors"]}
+
+    for doc_index, ((position, _), result, index) in enumerate(zip(valid, results, indexes)):
+        if doc_index in failed_writes:
+            items[position] = {"index": position, "status": "failed", "errors": [{"msg": failed_writes[doc_index]}]}
+            continue
+        del result["answers"]
+        record_result(result, index)
+        items[position] = {"index": position, "status": "created", "result": result}
+
+    created = sum(1 for item in items if item["status"] == "created")
+    return {"created": created, "failed": len(items) - created, "items": items}
+
+@api_router.get("/assessments", dependencies=[Depends(require_admin)])
+async def list_assessments(
+    industry: Optional[str] = None,
+    organization_name: Optional[str] = None,
+    maturity: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    include: Optional[str] = None,
+    framework: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+):
+    scored_with = get_framework(framework)
+    if maturity is not None and maturity not in MATURITY_LABELS:
+        raise HTTPException(status_code=422, detail=f"maturity must be one of {', '.join(MATURITY_LABELS)}")
+    include_fields = set(include.split(",")) if include else set()
+    unknown = include_fields - set(LIST_OPTIONAL_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Cannot include: {', '.join(sorted(unknown))}")
+    try:
+        query = build_list_query(industry, organization_name, maturity, created_from, created_to, cursor,
+                                 framework=framework_query(scored_with.id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    docs = await (
+        db.assessments.find(query, build_list_projection(include_fields))
+        .sort([("created_at", -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    docs = docs[:limit]
+    await FRAMEWORK_VERSIONS.resolve(docs)
+    items = [to_list_item(doc, *stored_decoders(doc)) for doc in docs]
+    return {"items": items, "next_cursor": next_cursor}
+
+@api_router.get("/assessments/export", dependencies=[Depends(require_admin)])
+async def export_assessments(
+    format: str = "ndjson",
+    industry: Optional[str] = None,
+    organization_name: Optional[str] = None,
+    maturity: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    framework: Optional[str] = None,
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=422, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    scored_with = get_framework(framework)
+    query = build_list_query(industry, organization_name, maturity, created_from, created_to,
+                             framework=framework_query(scored_with.id))
+    cursor = open_export_cursor(db.assessments, query, EXPORT_BATCH_SIZE)
+    filename = f"assessments-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.{format}"
+    return StreamingResponse(
+        stream_export(format, cursor, EXPORT_BATCH_SIZE, scored_with.index, scored_with.actions,
+                      FRAMEWORK_VERSIONS),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 @api_router.get("/assessment/{assessment_id}")
-async def get_assessment(assessment_id: str):
-    result = await db.assessments.find_one(
-        {"id": assessment_id},
-        {"_id": 0, "answers": 0}
-    )
-    if not result:
+async def get_assessment(assessment_id: str, request: Request):
+    observe_validation(request, "get")
+    result = await load_assessment(assessment_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Assessment not found")
+    # Results are never modified after submission.
+    return json_response(result, "get", {"Cache-Control": RESULT_CACHE_CONTROL})
+
+@api_router.post("/drafts")
+async def create_draft(draft: DraftCreate):
+    framework = get_framework(draft.framework, status_code=422)
+    now = datetime.now(timezone.utc)
+    doc = {
+        "_id": str(uuid.uuid4()),
+        "industry": draft.industry,
+        "organization_name": draft.organization_name,
+        "framework_id": framework.id,
+        "answers": {},
+        "created_at": now.isoformat(),
+        # BSON date; the TTL index expires drafts that stop being updated.
+        "updated_at": now,
+    }
+    await db.drafts.insert_one(doc)
+    return draft_response(doc)
+
+@api_router.get("/drafts/{draft_id}")
+async def get_draft(draft_id: str):
+    draft = await db.drafts.find_one({"_id": draft_id})
+    if not draft:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    return draft_response(draft)
+
+@api_router.patch("/drafts/{draft_id}")
+async def save_draft_answer(draft_id: str, answer: AssessmentAnswer):
+    # Only match drafts whose framework asks this question, so the answer is
+    # validated by the same single update that writes it.
+    framework_ids = FRAMEWORKS.frameworks_with_question(answer.question_id)
+    if BUILTIN_FRAMEWORK_ID in framework_ids:
+        framework_ids = framework_ids + [None]
+    if not await write_draft_answer(draft_id, answer, {"framework_id": {"$in": framework_ids}}):
+        if await db.drafts.count_documents({"_id": draft_id}, limit=1):
+            raise HTTPException(status_code=422, detail=f"Unknown question '{answer.question_id}'")
+        raise HTTPException(status_code=404, detail="Draft not found")
+    return {"id": draft_id, "question_id": answer.question_id, "score": answer.score}
+
+@api_router.websocket("/drafts/{draft_id}/live")
+async def live_draft(websocket: WebSocket, draft_id: str):
+    """Save answers to a draft and push incrementally updated scores back.
+
+    The client sends {"question_id", "score"} messages; every accepted answer
+    is persisted like PATCH /drafts/{id} and answered with an "update" event.
+    """
+    await websocket.accept()
+    draft = await db.drafts.find_one({"_id": draft_id}, {"answers": 1, "framework_id": 1})
+    if not draft:
+        await websocket.close(code=4404, reason="Draft not found")
+        return
+
+    index = stored_framework(draft).index
+    scorer = LiveScorer(index, draft.get("answers"))
+    await websocket.send_json({"type": "state", **scorer.state()})
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                answer = AssessmentAnswer.model_validate_json(message)
+            except ValidationError as e:
+                await websocket.send_json({"type": "error", "detail": e.errors(include_url=False)})
+                continue
+            if answer.question_id not in index.slots:
+                await websocket.send_json({"type": "error", "detail": f"Unknown question '{answer.question_id}'"})
+                continue
+            if not await write_draft_answer(draft_id, answer):
+                await websocket.close(code=4404, reason="Draft not found")
+                return
+            await websocket.send_json({"type": "update", **scorer.set(answer.question_id, answer.score)})
+    except WebSocketDisconnect:
+        pass
+
+@api_router.post("/drafts/{draft_id}/finalize")
+async def finalize_draft(
+    draft_id: str,
+    body: Optional[DraftFinalize] = None,
+    default_score: Optional[int] = Query(None, ge=1, le=5),
+):
+    # Claiming the draft by deleting it makes concurrent finalize calls safe.
+    draft = await db.drafts.find_one_and_delete({"_id": draft_id})
+    if not draft:
+        raise HTTPException(status_code=404, detail="Draft not found")
+
+    framework = stored_framework(draft)
+    saved = draft.get("answers", {})
+    if body is not None:
+        saved = {**saved, **{answer.question_id: answer.score for answer in body.answers}}
+    answers = [
+        AssessmentAnswer(question_id=qid, score=saved.get(qid, default_score))
+        for qid in framework.index.question_ids
+        if qid in saved or default_score is not None
+    ]
+    submission = AssessmentSubmission(
+        industry=draft["industry"],
+        organization_name=draft["organization_name"],
+        answers=answers,
+        framework=framework.id,
+    )
+    result = build_assessment_result(submission, score_submissions([submission], "finalize")[0])
+    try:
+        await store_result(result, "finalize")
+    except Exception:
+        await db.drafts.insert_one(draft)
+        raise
     return result
 
+@api_router.get("/benchmarks/{industry}")
+async def get_benchmarks(industry: str, assessment_id: Optional[str] = None):
+    if industry not in DEFAULT_FRAMEWORK.industries:
+        raise HTTPException(status_code=404, detail=f"Industry '{industry}' not found")
+    benchmarks = BENCHMARKS.summary(industry)
+    if assessment_id is None:
+        return benchmarks
+    result = await load_assessment(assessment_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Assessment not found")
+    if result.get("framework_id", BUILTIN_FRAMEWORK_ID) != DEFAULT_FRAMEWORK.id:
+        raise HTTPException(status_code=422, detail="Benchmarks only cover the default framework")
+    return {**benchmarks, "position": BENCHMARKS.position(industry, result)}
+
+@api_router.get("/rollups/{industry}")
+async def get_rollups(industry: str):
+    if industry != ALL_INDUSTRIES and industry not in DEFAULT_FRAMEWORK.industries:
+        raise HTTPException(status_code=404, detail=f"Industry '{industry}' not found")
+    rollup = await db.rollups.find_one({"_id": f"{industry}:{ROLLUPS.index.version}"}, {"_id": 0})
+    return rollup or {"industry": industry, "framework_version": ROLLUPS.index.version}
+
+@api_router.get("/analytics/summary")
+async def get_analytics_summary(industry: Optional[str] = None):
+    snapshot = SNAPSHOTS.get()
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="No analytics snapshot has been built yet")
+    return snapshot.summary(industry)
+
 @api_router.get("/recommendations/{industry}")
-async def get_recommendations(industry: str):
-    if industry not in INDUSTRY_RECOMMENDATIONS:
+async def get_recommendations(industry: str, request: Request, framework: Optional[str] = None):
+    entry = get_framework(framework).catalog["recommendations"].get(industry)
+    if entry is None:
         raise HTTPException(status_code=404, detail=f"Industry '{industry}' not found")
-    return INDUSTRY_RECOMMENDATIONS[industry]
+    return entry.response(request)
+
+@api_router.post("/admin/frameworks/reload", dependencies=[Depends(require_admin)])
+async def admin_reload_frameworks():
+    try:
+        changes = await reload_frameworks()
+    except (ValueError, KeyError) as e:
+        # FrameworkError and bad JSON are ValueErrors; the old frameworks stay live.
+        raise HTTPException(status_code=422, detail=str(e))
+    await FRAMEWORK_RELOADS.announce()
+    return {
+        **changes,
+        "default": DEFAULT_FRAMEWORK.id,
+        "frameworks": [framework.summary() for framework in FRAMEWORKS],
+    }
+
+@api_router.get("/admin/traces", dependencies=[Depends(require_admin)])
+async def admin_traces(
+    trace_id: Optional[str] = None,
+    min_duration_ms: float = Query(0.0, ge=0),
+    limit: int = Query(20, ge=1, le=200),
+):
+    if not isinstance(TRACER.exporter, RingBufferExporter):
+        raise HTTPException(status_code=404, detail="Traces are only kept in memory with TRACE_EXPORTER=memory")
+    traces = TRACER.exporter.find(trace_id, min_duration_ms, limit)
+    return {"sample_rate": TRACER.sample_rate, "traces": [trace.to_dict() for trace in traces]}
+
+@api_router.post("/admin/profile", dependencies=[Depends(require_admin)])
+async def admin_profile(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    threads: str = "loop",
+    allocations: bool = False,
+    output: str = "json",
+):
+    if threads not in ("loop", "all"):
+        raise HTTPException(status_code=422, detail="threads must be one of loop, all")
+    if output not in ("json", "collapsed"):
+        raise HTTPException(status_code=422, detail="output must be one of json, collapsed")
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    async with profile_lock:
+        # "loop" samples only the event loop thread, which runs the handlers and scoring.
+        sampler = StackSampler(interval_ms / 1000, {threading.get_ident()} if threads == "loop" else None)
+        tracker = None
+        if allocations:
+            tracker = AllocationTracker(
+                [(route.path, route.endpoint) for route in app.routes if hasattr(route, "endpoint")]
+            )
+            await asyncio.to_thread(tracker.start)
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            sampler.stop()
+            if tracker is not None:
+                await asyncio.to_thread(tracker.stop)
+
+    if output == "collapsed":
+        return PlainTextResponse(sampler.collapsed())
+    return {
+        "seconds": round(sampler.elapsed, 3),
+        "interval_ms": interval_ms,
+        "samples": sampler.samples,
+        "top_functions": sampler.top_functions(),
+        "collapsed": sampler.collapsed(),
+        "allocations": tracker.summary() if tracker is not None else None,
+    }
+
+@api_router.get("/cache/stats")
+async def cache_stats():
+    return {"results": RESULT_CACHE.stats(), "scores": SCORE_MEMO.stats()}
+
+@api_router.get("/metrics")
+async def metrics():
+    return PlainTextResponse(METRICS.render(), media_type=METRICS_CONTENT_TYPE)
 
 @api_router.get("/maturity-levels")
-async def get_maturity_levels():
-    return MATURITY_LEVELS
+async def get_maturity_levels(request: Request, framework: Optional[str] = None):
+    return get_framework(framework).catalog["maturity_levels"].response(request)
 
 app.include_router(api_router)
 
@@ -247,6 +847,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TracingMiddleware, tracer=TRACER)
+# Added last so it is outermost and its timings cover CORS handling too.
+app.add_middleware(MetricsMiddleware)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -254,6 +857,56 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+benchmark_task = None
+rollup_task = None
+framework_watch_task = None
+framework_sync_task = None
+
+@app.on_event("startup")
+async def ensure_db_indexes():
+    await ensure_indexes(db)
+
+@app.on_event("startup")
+async def start_write_queue():
+    if WRITE_QUEUE is not None:
+        WRITE_QUEUE.start()
+
+@app.on_event("startup")
+async def start_benchmarks():
+    global benchmark_task
+    await BENCHMARKS.load()
+    benchmark_task = asyncio.create_task(BENCHMARKS.run(BENCHMARK_FLUSH_SECONDS))
+
+@app.on_event("startup")
+async def start_rollups():
+    global rollup_task
+    rollup_task = asyncio.create_task(ROLLUPS.run(ROLLUP_FLUSH_SECONDS))
+
+@app.on_event("startup")
+async def start_framework_watch():
+    global framework_watch_task
+    if FRAMEWORK_WATCH_SECONDS > 0:
+        framework_watch_task = asyncio.create_task(
+            watch_frameworks(FRAMEWORKS_DIR, FRAMEWORK_WATCH_SECONDS, reload_frameworks)
+        )
+
+@app.on_event("startup")
+async def start_framework_sync():
+    global framework_sync_task
+    await FRAMEWORK_RELOADS.load()
+    if FRAMEWORK_SYNC_SECONDS > 0:
+        framework_sync_task = asyncio.create_task(FRAMEWORK_RELOADS.follow(FRAMEWORK_SYNC_SECONDS, reload_frameworks))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if WRITE_QUEUE is not None:
+        await WRITE_QUEUE.close()
+    background = [
+        task for task in (benchmark_task, rollup_task, framework_watch_task, framework_sync_task) if task is not None
+    ]
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    if TRACER.exporter is not None:
+        TRACER.exporter.close()
     client.close()
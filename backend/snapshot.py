@@ -0,0 +1,218 @@
+"""
+Columnar on-disk snapshot of all stored assessments for analytics.
+
+A snapshot directory holds:
+    manifest.json        framework version, column order, row count
+    answers.npy          N x Q uint8 answer matrix in compiled question order
+    overall_pct.npy      N float64
+    function_pct.npy     N x F float64
+    category_pct.npy     N x C float64 (NaN where the category was unanswered)
+    metadata.npz         id, industry, organization_name, created_at, overall_maturity
+    metadata.parquet     the same table, when pandas and pyarrow are installed
+
+The .npy files are meant to be opened with mmap_mode="r". Snapshots are
+written to a fresh directory and published by atomically replacing the
+CURRENT pointer file, so readers never see a half-written snapshot.
+"""
+
+import json
+import logging
+import os
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from framework import FRAMEWORK_INDEX
+from scoring import SCORING_ENGINE
+from storage import answer_vector
+
+logger = logging.getLogger(__name__)
+
+METADATA_FIELDS = ("id", "industry", "organization_name", "created_at", "overall_maturity")
+POINTER = "CURRENT"
+
+
+async def build_snapshot(collection, root, batch_size=5000, engine=SCORING_ENGINE, framework=None, versions=None):
+    """Materialize every assessment created up to now into a new snapshot under root.
+
+    framework is a Mongo filter selecting the assessments scored against
+    engine's framework; without it every document is read. versions, a
+    FrameworkVersions, decodes answers packed in earlier layouts; documents
+    whose answers cannot be decoded are left out.
+    """
+    index = engine.index
+    root = Path(root)
+    taken_at = datetime.now(timezone.utc)
+    query = {**(framework or {}), "created_at": {"$lte": taken_at.isoformat()}}
+    capacity = await collection.count_documents(query)
+
+    name = taken_at.strftime("%Y%m%dT%H%M%S%fZ")
+    path = root / name
+    path.mkdir(parents=True)
+
+    def open_column(filename, dtype, *shape):
+        return np.lib.format.open_memmap(path / filename, mode="w+", dtype=dtype, shape=(capacity, *shape))
+
+    answers = open_column("answers.npy", np.uint8, index.num_questions)
+    overall_pct = open_column("overall_pct.npy", np.float64)
+    function_pct = open_column("function_pct.npy", np.float64, len(index.functions))
+    category_pct = open_column("category_pct.npy", np.float64, len(index.category_codes))
+    metadata = {field: [] for field in METADATA_FIELDS}
+
+    rows = 0
+    projection = {"answers": 1, "answers_packed": 1, "framework_version": 1, **{field: 1 for field in METADATA_FIELDS}}
+    cursor = collection.find(query, projection).sort([("created_at", 1), ("_id", 1)]).batch_size(batch_size)
+    chunk = []
+    skipped = 0
+
+    async def write(chunk):
+        nonlocal rows, skipped
+        if versions is not None:
+            await versions.resolve(chunk)
+        vectors = [
+            answer_vector(doc, index, versions.decoders(doc, index, None)[0] if versions is not None else None)
+            for doc in chunk
+        ]
+        decoded = [(doc, vector) for doc, vector in zip(chunk, vectors) if vector is not None]
+        skipped += len(chunk) - len(decoded)
+        # Documents inserted with a back-dated created_at could exceed the count.
+        decoded = decoded[:capacity - rows]
+        if not decoded:
+            return
+        chunk = [doc for doc, _ in decoded]
+        end = rows + len(chunk)
+        matrix = np.stack([vector for _, vector in decoded])
+        scores = engine.score_matrix(matrix)
+        answers[rows:end] = matrix
+        overall_pct[rows:end] = scores.overall_pct
+        function_pct[rows:end] = scores.function_pct
+        category_pct[rows:end] = np.where(scores.category_answered, scores.category_pct, np.nan)
+        for doc in chunk:
+            for field in METADATA_FIELDS:
+                metadata[field].append(doc.get(field) or "")
+        rows = end
+
+    async for doc in cursor:
+        chunk.append(doc)
+        if len(chunk) >= batch_size:
+            await write(chunk)
+            chunk = []
+    await write(chunk)
+    if skipped:
+        logger.warning("Left %d assessments out of the snapshot: their answer layout is not recorded", skipped)
+
+    for column in (answers, overall_pct, function_pct, category_pct):
+        column.flush()
+    np.savez(path / "metadata.npz", **{field: np.array(values, dtype=str) for field, values in metadata.items()})
+    _write_parquet(path / "metadata.parquet", metadata)
+
+    manifest = {
+        "name": name,
+        "taken_at": taken_at.isoformat(),
+        "rows": rows,
+        "framework_version": index.version,
+        "question_ids": list(index.question_ids),
+        "function_ids": list(index.function_ids),
+        "category_codes": list(index.category_codes),
+    }
+    (path / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+    pointer = root / POINTER
+    tmp_pointer = root / f"{POINTER}.tmp"
+    tmp_pointer.write_text(name)
+    os.replace(tmp_pointer, pointer)
+    logger.info("Wrote assessment snapshot %s with %d rows", path, rows)
+    return path
+
+
+def _write_parquet(path, metadata):
+    try:
+        import pandas as pd
+        pd.DataFrame(metadata).to_parquet(path, index=False)
+    except ImportError:
+        logger.info("pandas/pyarrow not installed; skipping %s", path.name)
+
+
+class Snapshot:
+    """Memory-mapped view of one snapshot directory."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text())
+        rows = self.manifest["rows"]
+
+        def column(filename):
+            return np.load(self.path / filename, mmap_mode="r")[:rows]
+
+        self.answers = column("answers.npy")
+        self.overall_pct = column("overall_pct.npy")
+        self.function_pct = column("function_pct.npy")
+        self.category_pct = column("category_pct.npy")
+        with np.load(self.path / "metadata.npz") as metadata:
+            self.metadata = {field: metadata[field][:rows] for field in METADATA_FIELDS}
+
+    def __len__(self):
+        return self.manifest["rows"]
+
+    def summary(self, industry=None):
+        """Portfolio statistics, optionally restricted to one industry."""
+        mask = slice(None) if industry is None else self.metadata["industry"] == industry
+        overall = np.asarray(self.overall_pct[mask])
+        functions = np.asarray(self.function_pct[mask])
+        categories = np.asarray(self.category_pct[mask])
+        count = len(overall)
+
+        def mean(values):
+            return round(float(values.mean()), 1) if len(values) else None
+
+        labels, label_counts = np.unique(self.metadata["overall_maturity"][mask], return_counts=True)
+        with warnings.catch_warnings():
+            # All-NaN columns (category never answered) are reported as None.
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            category_means = np.nanmean(categories, axis=0)
+        return {
+            "snapshot": self.manifest["name"],
+            "taken_at": self.manifest["taken_at"],
+            "framework_version": self.manifest["framework_version"],
+            "industry": industry,
+            "count": count,
+            "overall_mean": mean(overall),
+            "functions": {
+                fid: mean(functions[:, i]) for i, fid in enumerate(self.manifest["function_ids"])
+            },
+            "categories": {
+                code: None if np.isnan(value) else round(float(value), 1)
+                for code, value in zip(self.manifest["category_codes"], category_means.tolist())
+            },
+            "maturity": dict(zip(labels.tolist(), label_counts.tolist())),
+        }
+
+
+def current_snapshot_path(root):
+    pointer = Path(root) / POINTER
+    if not pointer.exists():
+        return None
+    return Path(root) / pointer.read_text().strip()
+
+
+class SnapshotReader:
+    """Keeps the current snapshot mapped and follows the CURRENT pointer."""
+
+    def __init__(self, root, index=FRAMEWORK_INDEX):
+        self.root = Path(root)
+        self.index = index
+        self._snapshot = None
+
+    def get(self):
+        path = current_snapshot_path(self.root)
+        if path is None:
+            return None
+        if self._snapshot is None or self._snapshot.path != path:
+            snapshot = Snapshot(path)
+            if snapshot.manifest["framework_version"] != self.index.version:
+                logger.warning("Snapshot %s was built for framework %s, not %s",
+                               path.name, snapshot.manifest["framework_version"], self.index.version)
+            self._snapshot = snapshot
+        return self._snapshot
@@ -0,0 +1,139 @@
+"""
+Mongo document encoding for assessments.
+In compact storage mode, static template text is left out of stored
+documents and rehydrated from the action templates on read, and answers
+are stored as a 3-bit-per-question bitfield in framework slot order. The
+templates and layout of the framework version that scored a document are
+recorded in MongoDB (see versions.py) so it can be decoded after reloads.
+"""
+
+import logging
+import os
+
+import numpy as np
+
+from framework import ACTION_INDEX, FRAMEWORK_INDEX
+
+logger = logging.getLogger(__name__)
+
+STORAGE_MODES = ("full", "compact")
+STORAGE_MODE = os.environ.get('STORAGE_MODE', 'full')
+if STORAGE_MODE not in STORAGE_MODES:
+    raise ValueError(f"STORAGE_MODE must be one of {STORAGE_MODES}, got {STORAGE_MODE!r}")
+
+
+def compact_actions(actions):
+    """Keep only the template id and the per-assessment fields of each action."""
+    return [
+        {"id": a["id"], "current_score": a["current_score"], "target_score": a["target_score"]}
+        for a in actions
+    ]
+
+
+def hydrate_actions(stored, actions=ACTION_INDEX):
+    """Expand template references back into full actions.
+
+    Actions stored in full (every document written before compact mode, or
+    in full mode) are passed through unchanged.
+    """
+    hydrated = []
+    for a in stored:
+        if "title" in a:
+            hydrated.append(a)
+            continue
+        template = actions.by_id.get(a["id"])
+        if template is None:
+            logger.warning("Dropping stored action %s: no matching action template", a["id"])
+            continue
+        hydrated.append({**template, "current_score": a["current_score"], "target_score": a["target_score"]})
+    return hydrated
+
+
+# Fields that are stored but never part of an API result.
+RESULT_PROJECTION = {"_id": 0, "answers": 0, "answers_packed": 0}
+
+ANSWER_BITS = 3
+_BIT_WEIGHTS = np.array([4, 2, 1], dtype=np.uint8)
+
+
+def pack_answers(scores, index=FRAMEWORK_INDEX):
+    """Pack a per-slot score vector (0 = unanswered) into a tagged bitfield."""
+    scores = np.asarray(scores, dtype=np.uint8)
+    bits = (scores[:, None] >> np.array([2, 1, 0], dtype=np.uint8)) & 1
+    return {"framework_version": index.version, "data": np.packbits(bits.ravel()).tobytes()}
+
+
+def unpack_answer_matrix(packed, index=FRAMEWORK_INDEX):
+    """Decode a list of packed answer bitfields into an N x Q uint8 matrix."""
+    for p in packed:
+        if p["framework_version"] != index.version:
+            raise ValueError(
+                f"Packed answers use framework version {p['framework_version']}, "
+                f"expected {index.version}"
+            )
+    num_questions = index.num_questions
+    row_bytes = (num_questions * ANSWER_BITS + 7) // 8
+    raw = np.frombuffer(b"".join(bytes(p["data"]) for p in packed), dtype=np.uint8)
+    bits = np.unpackbits(raw.reshape(len(packed), row_bytes), axis=1, count=num_questions * ANSWER_BITS)
+    return bits.reshape(len(packed), num_questions, ANSWER_BITS) @ _BIT_WEIGHTS
+
+
+def unpack_answers(packed, index=FRAMEWORK_INDEX):
+    return unpack_answer_matrix([packed], index)[0]
+
+
+def answer_vector(doc, index=FRAMEWORK_INDEX, source=None):
+    """Per-slot score vector in index's layout for a stored document in either answer format.
+
+    source is the layout the document was scored with, when that may be an
+    earlier one; answers are then mapped onto index by question id. Returns
+    None if the answers are packed in a layout that is neither.
+    """
+    source = source or index
+    if "answers_packed" in doc and doc["answers_packed"]["framework_version"] == index.version:
+        return unpack_answers(doc["answers_packed"], index)
+    answers = answer_list(doc, source)
+    if answers is None:
+        return None
+    scores = np.zeros(index.num_questions, dtype=np.uint8)
+    for a in answers:
+        slot = index.slots.get(a["question_id"])
+        if slot is not None:
+            scores[slot] = a["score"]
+    return scores
+
+
+def answer_list(doc, index=FRAMEWORK_INDEX):
+    """Stored answers as question_id/score dicts, whichever format was stored.
+
+    Returns None if the answers are packed in a layout other than index's.
+    """
+    if "answers_packed" not in doc:
+        return doc.get("answers", [])
+    if doc["answers_packed"]["framework_version"] != index.version:
+        logger.warning("Skipping answers of %s: packed with framework layout %s, which is not recorded",
+                       doc.get("id"), doc["answers_packed"]["framework_version"])
+        return None
+    scores = unpack_answers(doc["answers_packed"], index).tolist()
+    return [
+        {"question_id": qid, "score": score}
+        for qid, score in zip(index.question_ids, scores)
+        if score
+    ]
+
+
+def to_document(result, index=FRAMEWORK_INDEX):
+    """Build the Mongo document for a freshly scored assessment result."""
+    doc = {**result, "_id": result["id"]}
+    if STORAGE_MODE == "compact":
+        doc["priority_actions"] = compact_actions(result["priority_actions"])
+        doc["answers_packed"] = pack_answers(answer_vector(doc, index), index)
+        del doc["answers"]
+    return doc
+
+
+def from_document(doc, actions=ACTION_INDEX):
+    """Turn a stored document (any storage mode) back into an API result."""
+    if "priority_actions" in doc:
+        doc["priority_actions"] = hydrate_actions(doc["priority_actions"], actions)
+    return doc
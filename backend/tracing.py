@@ -0,0 +1,320 @@
+"""
+Lightweight request tracing.
+
+TracingMiddleware opens a root span per HTTP request, continuing the trace
+from an incoming W3C traceparent (or X-Trace-Id) header and echoing the
+trace id in X-Trace-Id. Code inside the request opens child spans with
+Tracer.span(), and MongoSpanListener records every MongoDB command; Motor
+runs commands with the caller's context, so they attach to the right
+request. The current span lives in a ContextVar, and for requests that are
+not sampled span() does nothing beyond a lookup.
+
+A finished trace goes to the exporter as a whole: a ring buffer for the
+debug endpoint, or a file of OTLP/JSON lines that a collector can ingest.
+"""
+
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from pymongo import monitoring
+
+# Spans beyond this are counted, not kept, so huge batches cannot blow up a trace.
+MAX_SPANS_PER_TRACE = 1000
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+TRACE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# OTLP SpanKind and StatusCode values.
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+STATUS_OK, STATUS_ERROR = 1, 2
+
+_current_span = ContextVar("current_span", default=None)
+
+
+class Trace:
+    __slots__ = ("trace_id", "sampled", "root", "spans", "dropped")
+
+    def __init__(self, trace_id, sampled):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.root = None
+        self.spans = []
+        self.dropped = 0
+
+    @property
+    def duration_ms(self):
+        return (self.root.end_ns - self.root.start_ns) / 1e6
+
+    def to_dict(self):
+        origin = self.root.start_ns
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "start": self.root.start_ns / 1e9,
+            "duration_ms": round(self.duration_ms, 3),
+            "dropped_spans": self.dropped,
+            "spans": [span.to_dict(origin) for span in sorted(self.spans, key=lambda s: s.start_ns)],
+        }
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace, name, parent_id=None, kind=KIND_INTERNAL, attributes=None):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    @property
+    def trace_id(self):
+        return self.trace.trace_id
+
+    def finish(self, error=None):
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        # list.append is atomic, so Mongo spans finishing on executor threads are safe.
+        if len(self.trace.spans) < MAX_SPANS_PER_TRACE or self is self.trace.root:
+            self.trace.spans.append(self)
+        else:
+            self.trace.dropped += 1
+
+    def to_dict(self, origin_ns):
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_offset_ms": round((self.start_ns - origin_ns) / 1e6, 3),
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def to_otlp(self):
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": STATUS_ERROR, "message": self.error} if self.error else {"code": STATUS_OK},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def parse_trace_headers(traceparent=None, trace_id=None):
+    """(trace_id, parent_span_id, sampled) from incoming headers; sampled is None if undecided."""
+    if traceparent:
+        match = TRACEPARENT.match(traceparent.strip().lower())
+        if match and match.group(1) != "0" * 32:
+            return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+    if trace_id:
+        trace_id = trace_id.strip().lower()
+        if TRACE_ID.match(trace_id) and trace_id != "0" * 32:
+            return trace_id, None, None
+    return secrets.token_hex(16), None, None
+
+
+class RingBufferExporter:
+    """Keeps the most recent traces in memory for the debug endpoint."""
+
+    def __init__(self, capacity):
+        self.traces = deque(maxlen=capacity)
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+    def find(self, trace_id=None, min_duration_ms=0.0, limit=20):
+        """Newest first; a trace's duration is its root span's."""
+        found = []
+        for trace in reversed(self.traces):
+            if trace_id is not None and trace.trace_id != trace_id:
+                continue
+            if trace.duration_ms < min_duration_ms:
+                continue
+            found.append(trace)
+            if len(found) >= limit:
+                break
+        return found
+
+    def close(self):
+        pass
+
+
+class FileExporter:
+    """Appends each trace as one line of OTLP/JSON (an ExportTraceServiceRequest)."""
+
+    def __init__(self, path, service_name):
+        self.path = path
+        self.resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]}
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, trace):
+        line = json.dumps({
+            "resourceSpans": [{
+                "resource": self.resource,
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [span.to_otlp() for span in trace.spans],
+                }],
+            }],
+        }, separators=(",", ":"))
+        # One small buffered write per sampled trace; the file is local.
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    def __init__(self, exporter=None, sample_rate=0.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def start_trace(self, name, traceparent=None, trace_id=None, attributes=None):
+        """Open a request's root span and make it current; returns (span, context token).
+
+        The incoming traceparent's sampled flag is honoured; otherwise the
+        trace is sampled with probability sample_rate.
+        """
+        trace_id, parent_id, sampled = parse_trace_headers(traceparent, trace_id)
+        if sampled is None:
+            sampled = random.random() < self.sample_rate
+        trace = Trace(trace_id, sampled and self.exporter is not None)
+        span = trace.root = Span(trace, name, parent_id, KIND_SERVER, attributes)
+        return span, _current_span.set(span)
+
+    def end_trace(self, span, token, error=None):
+        _current_span.reset(token)
+        if not span.trace.sampled:
+            return
+        span.finish(error)
+        self.exporter.export(span.trace)
+
+    def start_span(self, name, kind=KIND_INTERNAL, **attributes):
+        """A child of the current span, or None when the request is not sampled."""
+        parent = _current_span.get()
+        if parent is None or not parent.trace.sampled:
+            return None
+        return Span(parent.trace, name, parent.span_id, kind, attributes)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.finish(e)
+            raise
+        else:
+            span.finish()
+        finally:
+            _current_span.reset(token)
+
+
+class MongoSpanListener(monitoring.CommandListener):
+    """Records a client span for every MongoDB command run inside a sampled request."""
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self._open = {}
+
+    def started(self, event):
+        span = self.tracer.start_span(
+            f"mongo.{event.command_name}", KIND_CLIENT,
+            **{"db.name": event.database_name, "db.operation": event.command_name},
+        )
+        if span is None:
+            return
+        collection = event.command.get(event.command_name)
+        if isinstance(collection, str):
+            span.attributes["db.collection"] = collection
+        self._open[(event.connection_id, event.request_id)] = span
+
+    def succeeded(self, event):
+        span = self._open.pop((event.connection_id, event.request_id), None)
+        if span is not None:
+            span.finish()
+
+    def failed(self, event):
+        span = self._open.pop((event.connection_id, event.request_id), None)
+        if span is not None:
+            span.error = str(event.failure.get("errmsg", event.failure))
+            span.finish()
+
+
+class TracingMiddleware:
+    """ASGI middleware giving every HTTP request a root span and an X-Trace-Id header."""
+
+    def __init__(self, app, tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {}
+        for key, value in scope["headers"]:
+            if key in (b"traceparent", b"x-trace-id"):
+                headers[key] = value.decode("latin-1")
+        span, token = self.tracer.start_trace(
+            f"{scope['method']} {scope['path']}",
+            headers.get(b"traceparent"), headers.get(b"x-trace-id"),
+            {"http.method": scope["method"]},
+        )
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                span.attributes["http.status_code"] = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-trace-id", span.trace_id.encode())]
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            # Name the span after the route template so traces group by endpoint.
+            route = scope.get("route")
+            if route is not None:
+                span.name = f"{scope['method']} {route.path}"
+                span.attributes["http.route"] = route.path
+            self.tracer.end_trace(span, token, error)
@@ -0,0 +1,100 @@
+"""
+Framework versions recorded in MongoDB for decoding stored assessments.
+
+Compact documents keep only references into their framework version: packed
+answers are in the slot order of its layout and priority actions are
+template ids. A process only compiles the definitions it loaded itself, so
+before a version scores anything its layout's question ids and its action
+templates are written to the framework_versions collection, keyed by the
+framework's content version. Any worker, a restarted server or the CLI can
+then decode documents scored by versions it never loaded.
+"""
+
+from pymongo.errors import DuplicateKeyError
+
+
+class StoredLayout:
+    """The question order of a recorded answer layout; decodes packed answers like a FrameworkIndex."""
+
+    def __init__(self, version, question_ids):
+        self.version = version
+        self.question_ids = tuple(question_ids)
+        self.slots = {qid: slot for slot, qid in enumerate(self.question_ids)}
+
+    @property
+    def num_questions(self):
+        return len(self.question_ids)
+
+
+class StoredActions:
+    """Recorded action templates by id; hydrates compact actions like an ActionIndex."""
+
+    def __init__(self, templates):
+        self.by_id = {template["id"]: template for template in templates}
+
+
+def version_document(framework):
+    return {
+        "_id": framework.version,
+        "framework_id": framework.id,
+        "layout_version": framework.index.version,
+        "question_ids": list(framework.index.question_ids),
+        "action_templates": list(framework.actions.by_id.values()),
+    }
+
+
+class FrameworkVersions:
+    """Layouts and action templates of every framework version, recorded or loaded on demand."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self._recorded = set()
+        self._layouts = {}
+        self._actions = {}
+
+    async def record(self, frameworks):
+        """Persist frameworks' layouts and templates; a no-op for versions already recorded."""
+        for framework in frameworks:
+            if framework.version in self._recorded:
+                continue
+            try:
+                await self._collection.update_one(
+                    {"_id": framework.version}, {"$setOnInsert": version_document(framework)}, upsert=True
+                )
+            except DuplicateKeyError:
+                # Another worker recorded it at the same moment.
+                pass
+            self._recorded.add(framework.version)
+            self._layouts[framework.index.version] = framework.index
+            self._actions[framework.version] = framework.actions
+
+    async def layout_versions(self, framework):
+        """Recorded versions of framework that share its answer layout, including its own."""
+        await self.record([framework])
+        query = {"framework_id": framework.id, "layout_version": framework.index.version}
+        return sorted([record["_id"] async for record in self._collection.find(query, {"_id": 1})])
+
+    async def resolve(self, docs):
+        """Load the recorded versions that docs were scored with and are not known here yet."""
+        versions = {doc.get("framework_version") for doc in docs} - set(self._actions) - {None}
+        layouts = {
+            doc["answers_packed"]["framework_version"] for doc in docs if "answers_packed" in doc
+        } - set(self._layouts)
+        if not versions and not layouts:
+            return
+        query = {"$or": [{"_id": {"$in": sorted(versions)}}, {"layout_version": {"$in": sorted(layouts)}}]}
+        async for record in self._collection.find(query):
+            self._layouts.setdefault(record["layout_version"],
+                                     StoredLayout(record["layout_version"], record["question_ids"]))
+            self._actions.setdefault(record["_id"], StoredActions(record["action_templates"]))
+
+    def decoders(self, doc, index, actions):
+        """(index, actions) to decode doc with, preferring the recorded version that scored it.
+
+        index and actions are used for whatever was not recorded; resolve()
+        the documents first to load versions recorded by other processes.
+        """
+        packed = doc.get("answers_packed")
+        if packed is not None:
+            index = self._layouts.get(packed["framework_version"], index)
+        return index, self._actions.get(doc.get("framework_version"), actions)
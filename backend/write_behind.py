@@ -0,0 +1,129 @@
+"""
+Write-behind batching for assessment inserts.
+Submissions are queued and flushed to Mongo with insert_many, either when a
+batch fills up or when the batching window closes.
+"""
+
+import asyncio
+import logging
+
+from pymongo.errors import BulkWriteError, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Coalesces single-document inserts into unordered insert_many batches.
+
+    put() blocks once max_pending documents are waiting, which pushes back on
+    submitters instead of growing memory without bound. close() flushes
+    everything still queued. Until its batch has been written, a document
+    can be read back with get(), so it is never missing from both the queue
+    and the collection.
+    """
+
+    def __init__(self, collection, max_batch=500, max_delay=0.05, max_pending=10000, retries=3):
+        self.collection = collection
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.retries = retries
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        # _id -> document, from put() until its batch is written or dropped.
+        self._pending = {}
+        self._task = None
+        self.batches = 0
+        self.written = 0
+        self.failed = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def put(self, doc):
+        if self._task is None or self._task.done():
+            raise RuntimeError("write-behind queue is not running")
+        self._pending[doc["_id"]] = doc
+        try:
+            await self._queue.put(doc)
+        except BaseException:
+            del self._pending[doc["_id"]]
+            raise
+
+    def get(self, doc_id):
+        """The queued document with this _id, or None if it is not waiting to be written."""
+        return self._pending.get(doc_id)
+
+    async def close(self):
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def stats(self):
+        return {
+            "pending": self._queue.qsize(),
+            "batches": self.batches,
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            doc = await self._queue.get()
+            if doc is _STOP:
+                break
+            batch = [doc]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    doc = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        doc = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if doc is _STOP:
+                    stopping = True
+                    break
+                batch.append(doc)
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        try:
+            await self._write(batch)
+        finally:
+            for doc in batch:
+                self._pending.pop(doc["_id"], None)
+
+    async def _write(self, batch):
+        self.batches += 1
+        for attempt in range(1, self.retries + 1):
+            try:
+                await self.collection.insert_many(batch, ordered=False)
+                self.written += len(batch)
+                return
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if attempt > 1:
+                    # Duplicate keys on a retry are documents the failed attempt already wrote.
+                    errors = [err for err in errors if err.get("code") != 11000]
+                self.written += len(batch) - len(errors)
+                self.failed += len(errors)
+                for err in errors:
+                    logger.error("Write-behind insert of %s failed: %s", batch[err["index"]].get("_id"), err.get("errmsg"))
+                return
+            except PyMongoError as e:
+                if attempt == self.retries:
+                    self.failed += len(batch)
+                    logger.error("Dropping write-behind batch of %d documents after %d attempts: %s", len(batch), attempt, e)
+                    return
+                logger.warning("Write-behind batch failed (attempt %d/%d), retrying: %s", attempt, self.retries, e)
+                await asyncio.sleep(0.1 * 2 ** attempt)
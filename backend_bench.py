@@ -0,0 +1,365 @@
+"""
+Microbenchmarks for the scoring and priority-action pipeline.
+
+    python backend_bench.py                      # run and compare with the baseline
+    python backend_bench.py --save-baseline      # run and record a new baseline
+    python backend_bench.py --filter score_matrix --max-size 10000
+
+Every benchmark runs over synthetic answer sets: full (every question,
+random scores), sparse (about 10% answered), all-low (every question 1),
+all-high (every question 5) and random (each assessment answers a random
+fraction). Single-assessment functions run over a pool of POOL_SIZE
+assessments per call; the vectorized scorer runs at batch sizes from 1 to
+1e6. Inputs are built by each benchmark's setup, so --filter and
+--max-size also skip building them.
+
+For each benchmark the median of several timed rounds gives ops/sec (one
+op = one assessment, or one score for get_maturity_label), and one extra
+run under tracemalloc gives the peak memory allocated during one call.
+Every round is followed by a round of a fixed reference workload. On
+shared machines the speed of the whole machine drifts by tens of percent
+over minutes, and that drift slows both alike, so the median ratio of the
+two (the relative cost) is what gets compared with the baseline.
+
+--save-baseline runs --baseline-passes full passes and records the median
+of each benchmark, so one lucky or unlucky pass does not skew every later
+comparison. When comparing, a benchmark whose relative cost, or peak
+allocation, exceeds the baseline by more than --tolerance is measured
+again after the full pass, up to --confirm times, keeping its best result.
+The script exits with 1 only if a benchmark stays beyond the tolerance
+every time. Baselines are machine-specific; record one on the machine that
+runs the comparison.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR / "backend"))
+# server builds its Motor client at import time; nothing here connects to it.
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "bench")
+
+import server  # noqa: E402
+from scoring import get_maturity_label, maturity_indices  # noqa: E402
+
+PROFILES = ("full", "sparse", "all-low", "all-high", "random")
+BATCH_SIZES = (1, 100, 10_000, 100_000, 1_000_000)
+# Materializing per-assessment dicts for 1e6 rows needs several GB.
+MAX_ROWS = 10_000
+POOL_SIZE = 100
+# Peak allocations may grow by this much before counting as a regression.
+ALLOCATION_SLACK_BYTES = 4096
+
+
+def answer_matrix(profile, n, num_questions, rng):
+    """N x Q uint8 answer matrix (0 = unanswered) for a synthetic profile."""
+    scores = rng.integers(1, 6, size=(n, num_questions), dtype=np.uint8)
+    if profile == "full":
+        return scores
+    if profile == "sparse":
+        return scores * (rng.random((n, num_questions)) < 0.1)
+    if profile == "all-low":
+        return np.ones((n, num_questions), dtype=np.uint8)
+    if profile == "all-high":
+        return np.full((n, num_questions), 5, dtype=np.uint8)
+    if profile == "random":
+        return scores * (rng.random((n, num_questions)) < rng.random((n, 1)))
+    raise ValueError(f"Unknown profile {profile!r}")
+
+
+def to_answers(row, question_ids):
+    return [
+        server.AssessmentAnswer(question_id=qid, score=int(score))
+        for qid, score in zip(question_ids, row)
+        if score
+    ]
+
+
+class Benchmark:
+    """A named workload; setup() builds its inputs and returns the function to time."""
+
+    def __init__(self, name, setup, ops):
+        self.name = name
+        self.setup = setup
+        self.ops = ops
+
+
+def build_benchmarks(framework, sizes, seed):
+    """Benchmarks in run order; no inputs are built until a benchmark's setup runs."""
+    engine = framework.engine
+    question_ids = framework.index.question_ids
+    num_questions = framework.index.num_questions
+
+    @lru_cache(maxsize=None)
+    def pool_inputs(profile):
+        """Answer sets, score rows and stored results for POOL_SIZE assessments."""
+        pool = answer_matrix(profile, POOL_SIZE, num_questions, np.random.default_rng(seed))
+        answer_sets = [to_answers(row, question_ids) for row in pool]
+        rows = list(engine.score_matrix(pool).rows())
+        results = []
+        for answers, scores in zip(answer_sets, rows):
+            submission = server.AssessmentSubmission(industry="healthcare", answers=answers, framework=framework.id)
+            results.append(server.build_assessment_result(submission, server.build_scored_fields(framework, scores)))
+        return answer_sets, rows, results
+
+    # Benchmarks of one batch size run back to back; keep only that matrix alive.
+    @lru_cache(maxsize=1)
+    def batch_matrix(profile, n):
+        return answer_matrix(profile, n, num_questions, np.random.default_rng([seed, n]))
+
+    for profile in PROFILES:
+        def calculate_scores(profile=profile):
+            answer_sets, _, _ = pool_inputs(profile)
+
+            def run():
+                for answers in answer_sets:
+                    server.calculate_scores(answers, framework)
+            return run
+
+        def maturity_labels(profile=profile):
+            _, rows, _ = pool_inputs(profile)
+            averages = [overall_avg for _, overall_avg, _, _ in rows] * 100
+
+            def run():
+                for avg in averages:
+                    get_maturity_label(avg)
+            return run
+
+        def radar_data(profile=profile):
+            _, rows, _ = pool_inputs(profile)
+
+            def run():
+                for _, _, function_scores, _ in rows:
+                    server.build_radar_data(function_scores)
+            return run
+
+        def priority_actions(profile=profile):
+            _, rows, _ = pool_inputs(profile)
+
+            def run():
+                for _, _, _, category_scores in rows:
+                    server.generate_priority_actions(category_scores, framework)
+            return run
+
+        def serialization(profile=profile):
+            _, _, results = pool_inputs(profile)
+
+            def run():
+                for result in results:
+                    server.JSONResponse(result)
+            return run
+
+        yield Benchmark(f"calculate_scores[{profile}] n=1", calculate_scores, POOL_SIZE)
+        yield Benchmark(f"get_maturity_label[{profile}] n=1", maturity_labels, POOL_SIZE * 100)
+        yield Benchmark(f"build_radar_data[{profile}] n=1", radar_data, POOL_SIZE)
+        yield Benchmark(f"generate_priority_actions[{profile}] n=1", priority_actions, POOL_SIZE)
+        yield Benchmark(f"serialization[{profile}] n=1", serialization, POOL_SIZE)
+
+        for n in sizes:
+            def score(profile=profile, n=n):
+                matrix = batch_matrix(profile, n)
+                return lambda: engine.score_matrix(matrix)
+
+            def score_rows(profile=profile, n=n):
+                matrix = batch_matrix(profile, n)
+                return lambda: list(engine.score_matrix(matrix).rows())
+
+            def indices(profile=profile, n=n):
+                avg = engine.score_matrix(batch_matrix(profile, n)).overall_avg
+                return lambda: maturity_indices(avg)
+
+            yield Benchmark(f"score_matrix[{profile}] n={n}", score, n)
+            if n <= MAX_ROWS:
+                yield Benchmark(f"score_rows[{profile}] n={n}", score_rows, n)
+            yield Benchmark(f"maturity_indices[{profile}] n={n}", indices, n)
+
+
+REFERENCE_MATRIX = np.ones((10_000, 62), dtype=np.uint8)
+
+
+def reference_workload():
+    """Interpreter- and memory-bound work in roughly the mix the benchmarks do."""
+    totals = {}
+    for i in range(2000):
+        totals[i % 97] = totals.get(i % 97, 0) + i
+    (REFERENCE_MATRIX * 3 + 1).sum(axis=1)
+
+
+@lru_cache(maxsize=1)
+def reference_timer():
+    """Timer and loop count for about 50 ms of the reference workload."""
+    timer = timeit.Timer(reference_workload)
+    number, _ = timer.autorange()
+    return timer, max(1, number // 4)
+
+
+def measure(benchmark, repeat):
+    fn = benchmark.setup()
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    reference, reference_number = reference_timer()
+    times = []
+    relative = []
+    for _ in range(repeat):
+        elapsed = timer.timeit(number) / number
+        times.append(elapsed)
+        relative.append(elapsed / (reference.timeit(reference_number) / reference_number))
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops": benchmark.ops,
+        "ops_per_sec": benchmark.ops / statistics.median(times),
+        "relative_cost": statistics.median(relative),
+        "peak_bytes": peak,
+    }
+
+
+def best_of(result, other):
+    return {
+        "ops": result["ops"],
+        "ops_per_sec": max(result["ops_per_sec"], other["ops_per_sec"]),
+        "relative_cost": min(result["relative_cost"], other["relative_cost"]),
+        "peak_bytes": min(result["peak_bytes"], other["peak_bytes"]),
+    }
+
+
+def median_of(results):
+    return {
+        "ops": results[0]["ops"],
+        "ops_per_sec": statistics.median(r["ops_per_sec"] for r in results),
+        "relative_cost": statistics.median(r["relative_cost"] for r in results),
+        "peak_bytes": statistics.median_low(r["peak_bytes"] for r in results),
+    }
+
+
+def speedup(result, previous):
+    """How much faster than previous result is; negative when slower."""
+    if "relative_cost" in previous:
+        return previous["relative_cost"] / result["relative_cost"] - 1
+    # Baselines recorded before relative costs were kept.
+    return result["ops_per_sec"] / previous["ops_per_sec"] - 1
+
+
+def compare(name, result, baseline, tolerance):
+    """Regression messages for one benchmark; empty if it is within tolerance."""
+    previous = baseline.get(name)
+    if previous is None:
+        return []
+    problems = []
+    if speedup(result, previous) < -tolerance:
+        problems.append(f"{-speedup(result, previous):.0%} slower relative to the reference workload "
+                        f"({result['ops_per_sec']:,.0f} ops/s vs {previous['ops_per_sec']:,.0f} baseline)")
+    if result["peak_bytes"] > previous["peak_bytes"] * (1 + tolerance) + ALLOCATION_SLACK_BYTES:
+        problems.append(f"{result['peak_bytes']:,} peak bytes vs {previous['peak_bytes']:,} baseline")
+    return problems
+
+
+def change(result, baseline, name):
+    previous = baseline.get(name)
+    if previous is None:
+        return "new"
+    return f"{speedup(result, previous) * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--baseline", type=Path, default=ROOT_DIR / "bench_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="allowed slowdown / allocation growth")
+    parser.add_argument("--baseline-passes", type=int, default=3,
+                        help="full passes when saving a baseline; each benchmark records its median")
+    parser.add_argument("--confirm", type=int, default=3,
+                        help="re-measurements of a suspected regression; it counts only if all stay beyond tolerance")
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose name matches this regex")
+    parser.add_argument("--max-size", type=int, default=max(BATCH_SIZES), help="largest batch size to run")
+    parser.add_argument("--repeat", type=int, default=7, help="timed rounds per benchmark (the median counts)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    framework = server.DEFAULT_FRAMEWORK
+    sizes = [n for n in BATCH_SIZES if n <= args.max_size]
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())["results"]
+
+    print(f"Scoring benchmarks: {framework.id} {framework.version}, {framework.index.num_questions} questions")
+    print(f"{'benchmark':<48} {'ops/s':>14} {'peak KiB':>11} {'vs base':>9}")
+    results = {}
+    measured = []
+    suspects = []
+    for benchmark in build_benchmarks(framework, sizes, args.seed):
+        if args.filter and not re.search(args.filter, benchmark.name):
+            continue
+        measured.append(benchmark)
+        result = results[benchmark.name] = measure(benchmark, args.repeat)
+        suspect = bool(compare(benchmark.name, result, baseline, args.tolerance))
+        if suspect:
+            suspects.append(benchmark)
+        print(f"{benchmark.name:<48} {result['ops_per_sec']:>14,.0f} {result['peak_bytes'] / 1024:>11,.1f} "
+              f"{change(result, baseline, benchmark.name):>9}{'  ?' if suspect else ''}")
+
+    regressions = []
+    if args.save_baseline:
+        passes = {name: [result] for name, result in results.items()}
+        for number in range(2, args.baseline_passes + 1):
+            print(f"Baseline pass {number} of {args.baseline_passes}")
+            for benchmark in measured:
+                passes[benchmark.name].append(measure(benchmark, args.repeat))
+        results = {name: median_of(measurements) for name, measurements in passes.items()}
+    elif suspects:
+        print(f"\nRe-measuring {len(suspects)} possible regression(s)")
+        for benchmark in suspects:
+            result = results[benchmark.name]
+            for _ in range(args.confirm):
+                result = best_of(result, measure(benchmark, args.repeat))
+                if not compare(benchmark.name, result, baseline, args.tolerance):
+                    break
+            results[benchmark.name] = result
+            problems = compare(benchmark.name, result, baseline, args.tolerance)
+            regressions.extend((benchmark.name, problem) for problem in problems)
+            print(f"{benchmark.name:<48} {result['ops_per_sec']:>14,.0f} {result['peak_bytes'] / 1024:>11,.1f} "
+                  f"{change(result, baseline, benchmark.name):>9}{'  ❌' if problems else '  ✓'}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "framework_version": framework.version,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "results": {**baseline, **results},
+        }, indent=2) + "\n")
+        print(f"\n📋 Baseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for name, problem in regressions:
+            print(f"  {name}: {problem}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,15 @@ const API = `${BACKEND_URL}/api`;
 
 const api = axios.create({ baseURL: API });
 
-export const getQuestions = () => api.get('/assessment/questions');
+export const getFrameworks = () => api.get('/frameworks');
+export const getQuestions = (framework) => api.get('/assessment/questions', { params: { framework } });
 export const getIndustries = () => api.get('/assessment/industries');
 export const submitAssessment = (data) => api.post('/assessment/submit', data);
+export const createDraft = (data) => api.post('/drafts', data);
+export const getDraft = (id) => api.get(`/drafts/${id}`);
+export const saveDraftAnswer = (id, answer) => api.patch(`/drafts/${id}`, answer);
+export const finalizeDraft = (id, answers, defaultScore) =>
+  api.post(`/drafts/${id}/finalize`, { answers }, { params: { default_score: defaultScore } });
 export const getAssessment = (id) => api.get(`/assessment/${id}`);
 export const getRecommendations = (industry) => api.get(`/recommendations/${industry}`);
 export const getMaturityLevels = () => api.get('/maturity-levels');
@@ -1,6 +1,13 @@
-import { useState, useEffect, useMemo } from "react";
+import { useState, useEffect, useMemo, useRef } from "react";
 import { useNavigate, useSearchParams } from "react-router-dom";
-import { getQuestions, submitAssessment } from "@/lib/api";
+import {
+  getQuestions,
+  submitAssessment,
+  createDraft,
+  getDraft,
+  saveDraftAnswer,
+  finalizeDraft,
+} from "@/lib/api";
 import { Button } from "@/components/ui/button";
 import { RadioGroup, RadioGroupItem } from "@/components/ui/radio-group";
 import { Label } from "@/components/ui/label";
@@ -36,6 +43,7 @@ export default function AssessmentPage() {
   const [searchParams] = useSearchParams();
   const industry = searchParams.get("industry") || "technology";
   const orgName = searchParams.get("org") || "Anonymous";
+  const framework = searchParams.get("framework") || undefined;
 
   const [data, setData] = useState(null);
   const [answers, setAnswers] = useState({});
@@ -43,9 +51,12 @@ export default function AssessmentPage() {
   const [activeCategory, setActiveCategory] = useState(null);
   const [submitting, setSubmitting] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [draftId, setDraftId] = useState(null);
+  const pendingSaves = useRef(new Set());
+  const draftKey = `nist-rmf-draft:${framework || "default"}:${industry}:${orgName}`;
 
   useEffect(() => {
-    getQuestions()
+    getQuestions(framework)
       .then((res) => {
         setData(res.data);
         setLoading(false);
@@ -54,7 +65,38 @@ export default function AssessmentPage() {
         toast.error("Failed to load questions");
         setLoading(false);
       });
-  }, []);
+  }, [framework]);
+
+  // Resume the draft for this industry/organization, or start a new one.
+  useEffect(() => {
+    let cancelled = false;
+    const startDraft = async () => {
+      const savedId = localStorage.getItem(draftKey);
+      if (savedId) {
+        try {
+          const res = await getDraft(savedId);
+          if (cancelled) return;
+          setAnswers((prev) => ({ ...res.data.answers, ...prev }));
+          setDraftId(savedId);
+          return;
+        } catch (err) {
+          localStorage.removeItem(draftKey);
+        }
+      }
+      try {
+        const res = await createDraft({ industry, organization_name: orgName, framework });
+        if (cancelled) return;
+        localStorage.setItem(draftKey, res.data.id);
+        setDraftId(res.data.id);
+      } catch (err) {
+        // Without a draft the assessment still works; it just isn't autosaved.
+      }
+    };
+    startDraft();
+    return () => {
+      cancelled = true;
+    };
+  }, [draftKey, industry, orgName, framework]);
 
   const functionQuestions = useMemo(() => {
     if (!data) return {};
@@ -112,7 +154,14 @@ export default function AssessmentPage() {
   };
 
   const handleAnswer = (questionId, score) => {
-    setAnswers((prev) => ({ ...prev, [questionId]: parseInt(score) }));
+    const value = parseInt(score);
+    setAnswers((prev) => ({ ...prev, [questionId]: value }));
+    if (draftId) {
+      const save = saveDraftAnswer(draftId, { question_id: questionId, score: value })
+        .catch(() => toast.error("Failed to autosave answer"))
+        .finally(() => pendingSaves.current.delete(save));
+      pendingSaves.current.add(save);
+    }
   };
 
   const handleNext = () => {
@@ -150,11 +199,27 @@ export default function AssessmentPage() {
     }));
 
     try {
-      const res = await submitAssessment({
-        industry,
-        organization_name: orgName,
-        answers: allAnswers,
-      });
+      let res;
+      if (draftId) {
+        await Promise.allSettled([...pendingSaves.current]);
+        try {
+          // Send every answer given so far; the server's copy misses any whose autosave failed.
+          const given = Object.entries(answers).map(([question_id, score]) => ({ question_id, score }));
+          res = await finalizeDraft(draftId, given, 1);
+        } catch (err) {
+          // The draft may have expired; fall back to a one-shot submission.
+          if (err.response?.status !== 404) throw err;
+        }
+        localStorage.removeItem(draftKey);
+      }
+      if (!res) {
+        res = await submitAssessment({
+          industry,
+          organization_name: orgName,
+          answers: allAnswers,
+          framework,
+        });
+      }
       toast.success("Assessment submitted successfully");
       navigate(`/results/${res.data.id}?industry=${industry}`);
     } catch (err) {
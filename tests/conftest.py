@@ -0,0 +1,44 @@
+import os
+import sys
+from collections import namedtuple
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+Answer = namedtuple("Answer", "question_id score")
+
+
+@pytest.fixture
+def random_answers():
+    """Factory for random answer lists over the built-in questions."""
+    from data.questions import QUESTIONS
+
+    def make(rng, p=None):
+        p = rng.random() if p is None else p
+        return [Answer(q["id"], rng.randint(1, 5)) for q in QUESTIONS if rng.random() < p]
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def server():
+    """The API module, importing on an in-memory mongomock-motor database."""
+    from mongomock_motor import AsyncMongoMockClient
+
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ.setdefault("DB_NAME", "tests")
+    with mock.patch("motor.motor_asyncio.AsyncIOMotorClient", AsyncMongoMockClient):
+        import server
+    return server
+
+
+@pytest.fixture
+def client(server):
+    """A TestClient with the app started; its portal runs coroutines on the app's loop."""
+    from fastapi.testclient import TestClient
+
+    with TestClient(server.app, raise_server_exceptions=False) as client:
+        yield client
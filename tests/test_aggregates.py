@@ -0,0 +1,59 @@
+import asyncio
+import copy
+import random
+
+from mongomock_motor import AsyncMongoMockClient
+
+from benchmarks import BenchmarkStore
+from cli import backfill_aggregates
+from rollups import RollupAggregator
+from registry import Framework, builtin_definition
+from tests.test_storage import scored_result
+
+
+def stored_results(random_answers, framework, industries):
+    rng = random.Random(5)
+    results = []
+    for n, industry in enumerate(industries):
+        result = scored_result(random_answers(rng))
+        results.append({**result, "_id": f"a{n}", "id": f"a{n}", "industry": industry, "overall_maturity": "Defined",
+                        "framework_id": framework.id, "framework_version": framework.version})
+    return results
+
+
+def test_backfill_replaces_aggregates_with_the_stored_assessments(random_answers):
+    framework = Framework(builtin_definition())
+    definition = copy.deepcopy(builtin_definition())
+    definition["questions"] = definition["questions"][1:]
+    other_layout = Framework(definition)
+    results = stored_results(random_answers, framework, ["healthcare", "finance", "healthcare", "unlisted"])
+    # Scored with another layout, so never part of these benchmarks.
+    stale = stored_results(random_answers, other_layout, ["healthcare"])[0]
+    db = AsyncMongoMockClient()["db"]
+
+    async def run():
+        await db.assessments.insert_many(results + [{**stale, "_id": "old", "id": "old"}])
+        for stale_store in (BenchmarkStore(db.benchmarks, framework.industries, framework.index),
+                            RollupAggregator(db.rollups, framework.industries, framework.index)):
+            stale_store.add("healthcare", results[0])
+            await stale_store.flush()
+
+        count = await backfill_aggregates(db, framework, batch_size=2)
+        rebuilt = BenchmarkStore(db.benchmarks, framework.industries, framework.index)
+        await rebuilt.load()
+        rollups = {doc["industry"]: doc async for doc in db.rollups.find()}
+        return count, rebuilt, rollups
+
+    count, rebuilt, rollups = asyncio.run(run())
+
+    expected = BenchmarkStore(None, framework.industries, framework.index)
+    for result in results:
+        expected.add(result["industry"], result)
+    assert count == len(results)
+    for industry in ("healthcare", "finance"):
+        assert rebuilt.summary(industry) == expected.summary(industry)
+    assert {industry: doc["overall"]["count"] for industry, doc in rollups.items()} == {
+        "all": 4, "healthcare": 2, "finance": 1,
+    }
+    healthcare = [r["overall_score"] for r in results if r["industry"] == "healthcare"]
+    assert rollups["healthcare"]["overall"]["sum"] == sum(healthcare)
@@ -0,0 +1,77 @@
+import gzip
+import json
+
+import pytest
+from starlette.requests import Request
+
+from catalog import CatalogEntry
+
+PAYLOAD = {"questions": [{"id": "gv-1-1", "question": "Are AI risks governed?"}]}
+
+
+def request(**headers):
+    return Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_identity_and_gzip_bodies_decode_to_the_payload():
+    entry = CatalogEntry(PAYLOAD)
+
+    plain = entry.response(request())
+    compressed = entry.response(request(accept_encoding="gzip, deflate"))
+
+    assert json.loads(plain.body) == PAYLOAD
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(compressed.body)) == PAYLOAD
+    assert plain.headers["etag"] != compressed.headers["etag"]
+    assert plain.headers["vary"] == compressed.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.parametrize("accept_encoding, gzipped", [
+    ("gzip", True),
+    ("br, GZIP;q=0.5", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.000", False),
+    ("*;q=0", False),
+    ("deflate, br", False),
+    ("", False),
+])
+def test_gzip_is_negotiated_from_accept_encoding(accept_encoding, gzipped):
+    response = CatalogEntry(PAYLOAD).response(request(accept_encoding=accept_encoding))
+    assert (response.headers.get("content-encoding") == "gzip") is gzipped
+
+
+@pytest.mark.parametrize("if_none_match", ["{etag}", "W/{etag}", '"other", {etag}', "{gzip_etag}", "*"])
+def test_matching_etags_are_not_modified(if_none_match):
+    entry = CatalogEntry(PAYLOAD)
+
+    response = entry.response(request(if_none_match=if_none_match.format(etag=entry.etag, gzip_etag=entry.gzip_etag)))
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == entry.etag
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_a_stale_etag_gets_the_full_body():
+    entry = CatalogEntry(PAYLOAD)
+    stale = CatalogEntry({"questions": []})
+
+    response = entry.response(request(if_none_match=stale.etag))
+
+    assert response.status_code == 200
+    assert json.loads(response.body) == PAYLOAD
+
+
+def test_catalog_endpoints_revalidate(client):
+    first = client.get("/api/assessment/questions")
+    repeat = client.get("/api/assessment/questions", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert first.headers["content-encoding"] == "gzip"
+    assert repeat.status_code == 304
+    assert repeat.headers["etag"] == first.headers["etag"]
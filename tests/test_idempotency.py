@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+import idempotency
+from framework import FRAMEWORK_INDEX
+from idempotency import request_hash, submission_key
+from tests.conftest import Answer
+
+FRAMEWORK = SimpleNamespace(id="nist-ai-rmf", version="v1", index=FRAMEWORK_INDEX)
+
+
+def submission(answers, organization_name="Acme"):
+    return SimpleNamespace(industry="healthcare", organization_name=organization_name, answers=answers)
+
+
+def test_request_hash_ignores_answer_order():
+    answers = [Answer("gv-1-1", 3), Answer("gv-1-2", 4)]
+    assert request_hash(submission(answers), FRAMEWORK) == request_hash(submission(answers[::-1]), FRAMEWORK)
+    assert request_hash(submission(answers), FRAMEWORK) != request_hash(submission(answers[:1]), FRAMEWORK)
+
+
+def test_header_keys_are_scoped_to_the_organization():
+    acme, other = submission([]), submission([], "Other")
+    assert submission_key(acme, FRAMEWORK, "h", "k1") == submission_key(acme, FRAMEWORK, "x", "k1")
+    assert submission_key(acme, FRAMEWORK, "h", "k1") != submission_key(other, FRAMEWORK, "h", "k1")
+
+
+def test_content_dedup_is_opt_in_and_skips_anonymous(monkeypatch):
+    assert submission_key(submission([]), FRAMEWORK, "h") is None
+    monkeypatch.setattr(idempotency, "IDEMPOTENCY_CONTENT_DEDUP", True)
+    assert submission_key(submission([]), FRAMEWORK, "h") == "sha256:v1:h"
+    assert submission_key(submission([], "Anonymous"), FRAMEWORK, "h") is None
@@ -0,0 +1,14 @@
+import pytest
+
+from listing import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    doc = {"created_at": "2026-01-01T00:00:00.123456+00:00", "_id": "3f1c9a9e-5e0b-4a8e-9c43-08f1f2a1b2c3"}
+    assert decode_cursor(encode_cursor(doc)) == (doc["created_at"], doc["_id"])
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", "W10", "WzEsMl0", "eyJhIjoxfQ"])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,54 @@
+import random
+
+from framework import FRAMEWORK_INDEX
+from live import LiveScorer
+from scoring import SCORING_ENGINE
+from tests.conftest import Answer
+
+
+def test_live_scorer_matches_batch_scoring():
+    rng = random.Random(0)
+    question_ids = FRAMEWORK_INDEX.question_ids
+    for _ in range(50):
+        scorer = LiveScorer()
+        answers = {}
+        for _ in range(rng.randint(1, 150)):
+            qid = rng.choice(question_ids)
+            score = rng.choice([0, 1, 2, 3, 4, 5])
+            scorer.set(qid, score)
+            if score:
+                answers[qid] = score
+            else:
+                answers.pop(qid, None)
+
+        overall_pct, overall_avg, function_scores, category_scores = next(
+            SCORING_ENGINE.score_answer_sets([[Answer(q, s) for q, s in answers.items()]]).rows()
+        )
+        state = scorer.state()
+        assert state["answered"] == len(answers)
+        assert state["overall_score"] == overall_pct
+        for func in state["functions"]:
+            expected = function_scores[func["id"]]
+            assert (func["score_pct"], func["avg_score"], func["maturity"]) == (
+                expected["score_pct"], expected["avg_score"], expected["maturity"])
+        for cat in state["categories"]:
+            if cat["code"] in category_scores:
+                expected = category_scores[cat["code"]]
+                assert cat["answered"]
+                assert (cat["score_pct"], cat["avg_score"], cat["maturity"]) == (
+                    expected["score_pct"], expected["avg_score"], expected["maturity"])
+            else:
+                assert not cat["answered"]
+        assert state["radar_data"] == [
+            {"function": data["name"], "score": data["score_pct"], "fullMark": 100}
+            for data in function_scores.values()
+        ]
+
+
+def test_live_scorer_restores_saved_answers():
+    answers = {qid: 3 for qid in FRAMEWORK_INDEX.question_ids[::2]}
+    restored = LiveScorer(answers=answers)
+    incremental = LiveScorer()
+    for qid, score in answers.items():
+        incremental.set(qid, score)
+    assert restored.state() == incremental.state()
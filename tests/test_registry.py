@@ -0,0 +1,67 @@
+import copy
+
+import pytest
+
+from registry import (
+    BUILTIN_FRAMEWORK_ID,
+    Framework,
+    FrameworkError,
+    FrameworkRegistry,
+    builtin_definition,
+    validate_definition,
+)
+
+
+def test_builtin_definition_is_valid():
+    validate_definition(builtin_definition())
+
+
+@pytest.mark.parametrize("question_id", ["gv.1", "$gv-1", "", 7])
+def test_question_ids_must_be_usable_as_field_names(question_id):
+    definition = copy.deepcopy(builtin_definition())
+    definition["questions"][0]["id"] = question_id
+    with pytest.raises(FrameworkError, match="question id"):
+        validate_definition(definition)
+
+
+def test_retain_keeps_replaced_versions():
+    old = FrameworkRegistry([Framework(builtin_definition())])
+    definition = copy.deepcopy(builtin_definition())
+    definition["questions"] = definition["questions"][1:]
+    new = FrameworkRegistry([Framework(definition)])
+    old_version, new_version = old.default.version, new.default.version
+
+    new.retain(old)
+
+    assert new.version(BUILTIN_FRAMEWORK_ID, old_version) is old.default
+    assert new.version(BUILTIN_FRAMEWORK_ID, new_version) is new.default
+    assert new.get() is new.default
+    assert new.version(BUILTIN_FRAMEWORK_ID, "unknown") is None
+
+
+def _action(definition):
+    return next(iter(next(iter(definition["action_templates"].values())).values()))["actions"][0]
+
+
+@pytest.mark.parametrize("mutate, message", [
+    (lambda d: _action(d).update(threshold="3"), "non-numeric threshold"),
+    (lambda d: _action(d).update(threshold=True), "non-numeric threshold"),
+    (lambda d: d["functions"][0].update(color=3), "non-string color"),
+    (lambda d: d["functions"].append("govern"), "must be an object"),
+    (lambda d: d["questions"].append(["GV-1"]), "must be an object"),
+    (lambda d: d.update(action_templates=[]), "action_templates must be an object"),
+    (lambda d: d.update(questions={}), "questions must be a list"),
+])
+def test_definition_types_are_validated(mutate, message):
+    definition = copy.deepcopy(builtin_definition())
+    mutate(definition)
+    with pytest.raises(FrameworkError, match=message):
+        Framework(definition)
+
+
+def test_compile_errors_are_framework_errors(monkeypatch):
+    monkeypatch.setattr("registry.validate_definition", lambda definition: None)
+    definition = copy.deepcopy(builtin_definition())
+    _action(definition)["threshold"] = "3"
+    with pytest.raises(FrameworkError, match="does not compile"):
+        Framework(definition)
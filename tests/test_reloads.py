@@ -0,0 +1,53 @@
+import asyncio
+
+from mongomock_motor import AsyncMongoMockClient
+
+from reloads import ReloadSignal
+
+
+def test_other_workers_follow_an_announced_reload():
+    collection = AsyncMongoMockClient()["db"]["framework_reloads"]
+    reloaded = []
+
+    def on_reload(name):
+        async def reload():
+            reloaded.append(name)
+        return reload
+
+    async def run():
+        announcer, follower = ReloadSignal(collection), ReloadSignal(collection)
+        await announcer.load()
+        await follower.load()
+        tasks = [
+            asyncio.create_task(signal.follow(0.01, on_reload(name)))
+            for name, signal in (("announcer", announcer), ("follower", follower))
+        ]
+        await announcer.announce()
+        await asyncio.sleep(0.1)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return announcer.generation, follower.generation
+
+    assert asyncio.run(run()) == (1, 1)
+    assert reloaded == ["follower"]
+
+
+def test_a_failed_follow_is_not_retried_every_poll():
+    collection = AsyncMongoMockClient()["db"]["framework_reloads"]
+    attempts = []
+
+    async def failing_reload():
+        attempts.append(1)
+        raise ValueError("invalid definition")
+
+    async def run():
+        await ReloadSignal(collection).announce()
+        follower = ReloadSignal(collection)
+        task = asyncio.create_task(follower.follow(0.01, failing_reload))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert len(attempts) == 1
@@ -0,0 +1,77 @@
+import random
+
+import numpy as np
+import pytest
+
+from data.questions import FUNCTIONS, QUESTIONS
+from scoring import SCORING_ENGINE, _round1, get_maturity_label
+
+
+def reference_scores(answers):
+    """The original dict-based calculate_scores, kept as the oracle."""
+    answer_map = {a.question_id: a.score for a in answers}
+    function_scores = {}
+    category_scores = {}
+    for func in FUNCTIONS:
+        func_total = func_weight = 0
+        cat_groups = {}
+        for q in QUESTIONS:
+            if q["function"] != func["id"]:
+                continue
+            score = answer_map.get(q["id"], 0)
+            if score == 0:
+                continue
+            weight = q.get("weight", 1)
+            func_total += score * weight
+            func_weight += 5 * weight
+            group = cat_groups.setdefault(q["category"], {"total": 0, "max": 0, "name": q["category_name"]})
+            group["total"] += score * weight
+            group["max"] += 5 * weight
+        func_avg = round((func_total / func_weight * 5) if func_weight > 0 else 0, 1)
+        function_scores[func["id"]] = {
+            "name": func["name"],
+            "code": func["code"],
+            "score_pct": round((func_total / func_weight * 100) if func_weight > 0 else 0, 1),
+            "avg_score": func_avg,
+            "maturity": get_maturity_label(func_avg),
+            "color": func["color"],
+        }
+        for cat, data in cat_groups.items():
+            cat_avg = round(data["total"] / data["max"] * 5, 1)
+            category_scores[cat] = {
+                "name": data["name"],
+                "function": func["id"],
+                "score_pct": round(data["total"] / data["max"] * 100, 1),
+                "avg_score": cat_avg,
+                "maturity": get_maturity_label(cat_avg),
+            }
+    total_score = sum(a.score for a in answers)
+    max_score = len(answers) * 5
+    overall_pct = round((total_score / max_score * 100) if max_score > 0 else 0, 1)
+    overall_avg = round((total_score / max_score * 5) if max_score > 0 else 0, 1)
+    return overall_pct, overall_avg, function_scores, category_scores
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_score_matrix_matches_dict_scoring(seed, random_answers):
+    rng = random.Random(seed)
+    answer_sets = [random_answers(rng) for _ in range(200)]
+    rows = list(SCORING_ENGINE.score_answer_sets(answer_sets).rows())
+    for answers, row in zip(answer_sets, rows):
+        assert row == reference_scores(answers)
+
+
+def test_empty_and_full_answer_sets(random_answers):
+    rng = random.Random(0)
+    for answers in ([], random_answers(rng, p=1.0)):
+        assert next(SCORING_ENGINE.score_answer_sets([answers]).rows()) == reference_scores(answers)
+
+
+def test_round1_matches_builtin_round():
+    rng = np.random.default_rng(0)
+    # Ratios of small integers hit exact .x5 ties far more often than random floats.
+    totals = rng.integers(0, 500, 100_000)
+    maxima = rng.integers(1, 500, 100_000)
+    values = np.concatenate([totals / maxima * 100, totals / maxima * 5, rng.random(10_000) * 100])
+    expected = np.array([round(v, 1) for v in values.tolist()])
+    assert np.array_equal(_round1(values), expected)
@@ -0,0 +1,67 @@
+import copy
+import random
+
+import bson
+import numpy as np
+
+import storage
+from framework import ACTION_INDEX, FRAMEWORK_INDEX
+from registry import Framework, builtin_definition
+from scoring import SCORING_ENGINE
+from storage import answer_list, answer_vector, from_document, pack_answers, to_document, unpack_answer_matrix
+
+
+def scored_result(answers):
+    overall_pct, _, function_scores, category_scores = next(SCORING_ENGINE.score_answer_sets([answers]).rows())
+    return {
+        "id": "a1",
+        "industry": "healthcare",
+        "overall_score": overall_pct,
+        "function_scores": function_scores,
+        "category_scores": category_scores,
+        "priority_actions": ACTION_INDEX.generate(category_scores),
+        "answers": [{"question_id": a.question_id, "score": a.score} for a in answers],
+        "created_at": "2026-01-01T00:00:00+00:00",
+    }
+
+
+def test_pack_unpack_round_trip():
+    rng = np.random.default_rng(0)
+    matrix = rng.integers(0, 6, size=(500, FRAMEWORK_INDEX.num_questions), dtype=np.uint8)
+    packed = [bson.decode(bson.encode({"p": pack_answers(row)}))["p"] for row in matrix]
+    assert np.array_equal(unpack_answer_matrix(packed), matrix)
+
+
+def test_compact_document_round_trips_through_bson(monkeypatch, random_answers):
+    monkeypatch.setattr(storage, "STORAGE_MODE", "compact")
+    rng = random.Random(0)
+    for _ in range(50):
+        answers = random_answers(rng)
+        result = scored_result(answers)
+        doc = bson.decode(bson.encode(to_document(result)))
+
+        assert "answers" not in doc
+        assert all(set(a) == {"id", "current_score", "target_score"} for a in doc["priority_actions"])
+        # Stored answer order is slot order, not submission order.
+        assert sorted(answer_list(doc), key=lambda a: a["question_id"]) == sorted(
+            result["answers"], key=lambda a: a["question_id"])
+        assert from_document(doc)["priority_actions"] == result["priority_actions"]
+
+
+def test_hydrate_passes_full_actions_through(random_answers):
+    result = scored_result(random_answers(random.Random(1), p=0.5))
+    assert storage.hydrate_actions(result["priority_actions"]) == result["priority_actions"]
+
+
+def test_answer_vector_maps_packed_answers_from_an_earlier_layout(monkeypatch, random_answers):
+    monkeypatch.setattr(storage, "STORAGE_MODE", "compact")
+    definition = copy.deepcopy(builtin_definition())
+    definition["questions"] = definition["questions"][::-1][1:]
+    index = Framework(definition).index
+    answers = random_answers(random.Random(2), p=0.8)
+    doc = to_document(scored_result(answers))
+
+    vector = answer_vector(doc, index, FRAMEWORK_INDEX)
+
+    expected = {a.question_id: a.score for a in answers if a.question_id in index.slots}
+    assert {qid: score for qid, score in zip(index.question_ids, vector.tolist()) if score} == expected
@@ -0,0 +1,70 @@
+import uuid
+
+
+def payload(score=3, organization_name="Acme"):
+    return {
+        "industry": "healthcare",
+        "organization_name": organization_name,
+        "answers": [{"question_id": "gv-1-1", "score": score}, {"question_id": "mp-1-1", "score": 2}],
+    }
+
+
+def submit(client, body, key):
+    return client.post("/api/assessment/submit", json=body, headers={"Idempotency-Key": key})
+
+
+def claim_key(server, body, key):
+    submission = server.AssessmentSubmission.model_validate(body)
+    framework = server.get_framework(None)
+    digest = server.request_hash(submission, framework)
+    return server.submission_key(submission, framework, digest, key), digest
+
+
+def test_a_repeated_key_replays_the_stored_result(client):
+    key = str(uuid.uuid4())
+    first = submit(client, payload(), key)
+    repeat = submit(client, payload(), key)
+
+    assert first.status_code == repeat.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert repeat.headers["Idempotent-Replayed"] == "true"
+    assert repeat.json() == first.json()
+
+
+def test_a_key_reused_for_a_different_submission_is_rejected(client):
+    key = str(uuid.uuid4())
+    assert submit(client, payload(score=3), key).status_code == 200
+
+    response = submit(client, payload(score=4), key)
+
+    assert response.status_code == 422
+    assert "different submission" in response.json()["detail"]
+
+
+def test_a_repeat_of_an_unstored_claim_is_a_conflict(client, server):
+    key = str(uuid.uuid4())
+    claimed, digest = claim_key(server, payload(), key)
+    client.portal.call(server.db.submission_keys.insert_one,
+                       {"_id": claimed, "assessment_id": "still-scoring", "request_hash": digest})
+
+    response = submit(client, payload(), key)
+
+    assert response.status_code == 409
+
+
+def test_a_failed_store_releases_the_claim(client, server, monkeypatch):
+    key = str(uuid.uuid4())
+    claimed, _ = claim_key(server, payload(), key)
+    store_result = server.store_result
+
+    async def failing_store(result, route="submit"):
+        raise RuntimeError("insert failed")
+
+    monkeypatch.setattr(server, "store_result", failing_store)
+    assert submit(client, payload(), key).status_code == 500
+    assert client.portal.call(server.db.submission_keys.find_one, {"_id": claimed}) is None
+
+    monkeypatch.setattr(server, "store_result", store_result)
+    retry = submit(client, payload(), key)
+    assert retry.status_code == 200
+    assert "Idempotent-Replayed" not in retry.headers
@@ -0,0 +1,63 @@
+from pymongo.errors import BulkWriteError
+
+
+def assessment(organization_name, score=3, **extra):
+    return {
+        "industry": "finance",
+        "organization_name": organization_name,
+        "answers": [{"question_id": "gv-1-1", "score": score}, {"question_id": "ms-1-1", "score": 4}],
+        **extra,
+    }
+
+
+def submit_batch(client, assessments):
+    return client.post("/api/assessment/submit-batch", json={"assessments": assessments})
+
+
+def test_each_item_reports_its_own_status(client, server):
+    response = submit_batch(client, [
+        assessment("Valid A"),
+        assessment("Bad score", score=9),
+        assessment("Unknown framework", framework="missing"),
+        assessment("Valid B"),
+    ])
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [item["status"] for item in body["items"]] == ["created", "invalid", "invalid", "created"]
+    assert [item["index"] for item in body["items"]] == [0, 1, 2, 3]
+    assert (body["created"], body["failed"]) == (2, 2)
+    assert body["items"][2]["errors"][0]["loc"] == ["framework"]
+    stored = client.portal.call(server.db.assessments.find_one, {"_id": body["items"][3]["result"]["id"]})
+    assert stored["organization_name"] == "Valid B"
+
+
+def test_batches_over_the_limit_are_rejected(client, server, monkeypatch):
+    monkeypatch.setattr(server, "MAX_BATCH_SIZE", 2)
+
+    response = submit_batch(client, [assessment(f"Org {n}") for n in range(3)])
+
+    assert response.status_code == 413
+
+
+def test_write_errors_map_back_to_input_positions(client, server, monkeypatch):
+    collection_type = type(server.db.assessments)
+    insert_many = collection_type.insert_many
+
+    async def failing_second_document(self, documents, ordered=True):
+        # The second valid document fails; the others are written.
+        await insert_many(self, documents[:1] + documents[2:], ordered=ordered)
+        raise BulkWriteError({"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]})
+
+    monkeypatch.setattr(collection_type, "insert_many", failing_second_document)
+    response = submit_batch(client, [
+        assessment("Bad score", score=0),
+        assessment("First"),
+        assessment("Second"),
+        assessment("Third"),
+    ])
+
+    items = response.json()["items"]
+    assert [item["status"] for item in items] == ["invalid", "created", "failed", "created"]
+    assert items[2]["errors"] == [{"msg": "duplicate key"}]
+    assert [items[n]["result"]["organization_name"] for n in (1, 3)] == ["First", "Third"]
@@ -0,0 +1,74 @@
+import asyncio
+import copy
+import random
+
+from mongomock_motor import AsyncMongoMockClient
+
+import storage
+from listing import to_list_item
+from registry import Framework, builtin_definition
+from storage import answer_vector, to_document
+from tests.test_storage import scored_result
+from versions import FrameworkVersions
+
+
+def edited_framework():
+    """The built-in framework with one question dropped and every action title changed."""
+    definition = copy.deepcopy(builtin_definition())
+    definition["questions"] = definition["questions"][1:]
+    for categories in definition["action_templates"].values():
+        for category in categories.values():
+            for action in category["actions"]:
+                action["title"] += " (v2)"
+    return Framework(definition)
+
+
+def stored_document(monkeypatch, answers):
+    monkeypatch.setattr(storage, "STORAGE_MODE", "compact")
+    builtin = Framework(builtin_definition())
+    doc = to_document({**scored_result(answers), "framework_version": builtin.version}, builtin.index)
+    return builtin, doc
+
+
+def test_other_processes_decode_recorded_versions(monkeypatch, random_answers):
+    answers = random_answers(random.Random(3), p=0.3)
+    builtin, doc = stored_document(monkeypatch, answers)
+    collection = AsyncMongoMockClient()["db"]["framework_versions"]
+    edited = edited_framework()
+
+    async def decode_elsewhere():
+        await FrameworkVersions(collection).record([builtin])
+        # A restarted process that only compiled the edited definition.
+        versions = FrameworkVersions(collection)
+        await versions.record([edited])
+        await versions.resolve([doc])
+        return versions.decoders(doc, edited.index, edited.actions)
+
+    index, actions = asyncio.run(decode_elsewhere())
+    item = to_list_item(dict(doc), index, actions)
+
+    assert index.version == builtin.index.version
+    assert sorted(a["question_id"] for a in item["answers"]) == sorted(a.question_id for a in answers)
+    assert item["priority_actions"] == scored_result(answers)["priority_actions"]
+    vector = answer_vector(doc, edited.index, index)
+    assert vector.tolist() == [
+        {a.question_id: a.score for a in answers}.get(qid, 0) for qid in edited.index.question_ids
+    ]
+
+
+def test_unrecorded_layouts_are_skipped_not_raised(monkeypatch, random_answers):
+    answers = random_answers(random.Random(4), p=0.3)
+    _, doc = stored_document(monkeypatch, answers)
+    collection = AsyncMongoMockClient()["db"]["framework_versions"]
+    edited = edited_framework()
+
+    async def decode():
+        versions = FrameworkVersions(collection)
+        await versions.resolve([doc])
+        return versions.decoders(doc, edited.index, edited.actions)
+
+    index, actions = asyncio.run(decode())
+
+    assert index is edited.index
+    assert answer_vector(doc, edited.index, index) is None
+    assert to_list_item(dict(doc), index, actions)["answers"] is None
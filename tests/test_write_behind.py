@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import AutoReconnect
+
+from write_behind import WriteBehindQueue
+
+
+class RecordingCollection:
+    """A mongomock collection that records insert_many batch sizes and can fail or block."""
+
+    def __init__(self, fail_first=None, fail_always=False):
+        self.inner = AsyncMongoMockClient()["db"]["assessments"]
+        self.batches = []
+        self.fail_first = fail_first
+        self.fail_always = fail_always
+        self.gate = None
+
+    async def insert_many(self, docs, ordered=True):
+        self.batches.append(len(docs))
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail_always:
+            raise AutoReconnect("connection lost")
+        if self.fail_first is not None:
+            # Part of the batch reaches the server before the connection drops.
+            written, self.fail_first = self.fail_first, None
+            await self.inner.insert_many(docs[:written], ordered=ordered)
+            raise AutoReconnect("connection lost")
+        return await self.inner.insert_many(docs, ordered=ordered)
+
+    async def ids(self):
+        return sorted([doc["_id"] async for doc in self.inner.find({}, {"_id": 1})])
+
+
+def docs(n, start=0):
+    return [{"_id": f"d{i:03}", "n": i} for i in range(start, start + n)]
+
+
+def run(test):
+    return asyncio.run(test())
+
+
+def test_batches_fill_up_to_max_batch():
+    collection = RecordingCollection()
+
+    async def test():
+        queue = WriteBehindQueue(collection, max_batch=3, max_delay=10)
+        queue.start()
+        for doc in docs(7):
+            await queue.put(doc)
+        await queue.close()
+        return queue
+
+    queue = run(test)
+    assert collection.batches == [3, 3, 1]
+    assert queue.stats() == {"pending": 0, "batches": 3, "written": 7, "failed": 0}
+
+
+def test_partial_batches_are_written_when_the_window_closes():
+    collection = RecordingCollection()
+
+    async def test():
+        queue = WriteBehindQueue(collection, max_batch=100, max_delay=0.02)
+        queue.start()
+        for doc in docs(2):
+            await queue.put(doc)
+        queued = [queue.get(doc["_id"]) is not None for doc in docs(2)]
+        await asyncio.sleep(0.2)
+        written = await collection.ids()
+        left = [queue.get(doc["_id"]) for doc in docs(2)]
+        await queue.close()
+        return queued, written, left
+
+    queued, written, left = run(test)
+    assert queued == [True, True]
+    assert collection.batches == [2]
+    assert written == ["d000", "d001"]
+    assert left == [None, None]
+
+
+def test_put_blocks_once_max_pending_documents_are_waiting():
+    collection = RecordingCollection()
+
+    async def test():
+        collection.gate = asyncio.Event()
+        queue = WriteBehindQueue(collection, max_batch=1, max_delay=0, max_pending=2)
+        queue.start()
+        first, second, third, blocked = docs(4)
+        await queue.put(first)
+        await asyncio.sleep(0.01)  # the writer takes it and waits on the gate
+        await queue.put(second)
+        await queue.put(third)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(queue.put(blocked), 0.05)
+        abandoned = queue.get(blocked["_id"])
+        collection.gate.set()
+        await queue.close()
+        return abandoned, queue
+
+    abandoned, queue = run(test)
+    # A put that gave up is not readable from the queue.
+    assert abandoned is None
+    assert queue.stats()["written"] == 3
+
+
+def test_duplicate_keys_on_a_retry_are_not_failures():
+    collection = RecordingCollection(fail_first=2)
+
+    async def test():
+        queue = WriteBehindQueue(collection, max_batch=5, max_delay=10)
+        queue.start()
+        for doc in docs(5):
+            await queue.put(doc)
+        await queue.close()
+        return queue, await collection.ids()
+
+    queue, written = run(test)
+    assert collection.batches == [5, 5]
+    assert written == [doc["_id"] for doc in docs(5)]
+    assert (queue.written, queue.failed) == (5, 0)
+
+
+def test_duplicate_keys_on_the_first_attempt_are_failures():
+    collection = RecordingCollection()
+
+    async def test():
+        await collection.inner.insert_one(docs(1, start=1)[0])
+        queue = WriteBehindQueue(collection, max_batch=5, max_delay=10)
+        queue.start()
+        for doc in docs(3):
+            await queue.put(doc)
+        await queue.close()
+        return queue
+
+    queue = run(test)
+    assert (queue.written, queue.failed) == (2, 1)
+
+
+def test_dropped_batches_leave_nothing_pending():
+    collection = RecordingCollection(fail_always=True)
+
+    async def test():
+        queue = WriteBehindQueue(collection, max_batch=5, max_delay=10, retries=2)
+        queue.start()
+        for doc in docs(3):
+            await queue.put(doc)
+        await queue.close()
+        return queue, [queue.get(doc["_id"]) for doc in docs(3)]
+
+    queue, left = run(test)
+    assert collection.batches == [3, 3]
+    assert (queue.written, queue.failed) == (0, 3)
+    assert left == [None, None, None]
+
+
+def test_close_drains_everything_queued():
+    collection = RecordingCollection()
+
+    async def test():
+        queue = WriteBehindQueue(collection, max_batch=100, max_delay=10)
+        queue.start()
+        for doc in docs(50):
+            await queue.put(doc)
+        await queue.close()
+        with pytest.raises(RuntimeError):
+            await queue.put(docs(1, start=50)[0])
+        return await collection.ids()
+
+    assert run(test) == [doc["_id"] for doc in docs(50)]